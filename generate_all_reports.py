@@ -4,132 +4,116 @@ Generate HTML overview of all runs across all days.
 Usage: python generate_all_reports.py
 """
 
+import hashlib
 import json
+import os
+import pickle
+import re
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from html import escape
+from itertools import groupby
+from operator import itemgetter
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
 
+try:
+    import orjson
+    json_loads = orjson.loads
+
+    def json_dumps(obj: Any) -> str:
+        return orjson.dumps(obj).decode("utf-8")
+except ImportError:
+    json_loads = json.loads
+
+    def json_dumps(obj: Any) -> str:
+        return json.dumps(obj, ensure_ascii=False, separators=(',', ':'))
+
 BASE_DIR = Path(__file__).resolve().parent
 RUNS_DIR = BASE_DIR / "runs"
+RESULTS_CACHE_PATH = RUNS_DIR / "all_runs_cache.pkl"
 
+FINGERPRINT_RE = re.compile(r"<!-- fingerprint: ([0-9a-f]+) -->")
 
-def load_all_results() -> List[Dict[str, Any]]:
-    """Load all results from all run directories."""
-    all_results = []
-    
-    for day_dir in sorted(RUNS_DIR.iterdir()):
-        if not day_dir.is_dir():
-            continue
-        
-        # Find all _all.json files in this day
-        for json_file in day_dir.glob("*_all.json"):
-            try:
-                with open(json_file, 'r', encoding='utf-8') as f:
-                    results = json.load(f)
-                    if isinstance(results, list):
-                        all_results.extend(results)
-                    else:
-                        all_results.append(results)
-            except Exception as e:
-                print(f"Warning: Could not load {json_file}: {e}")
-    
-    return all_results
 
-
-def generate_overview_html(results: List[Dict[str, Any]], output_path: Path) -> None:
-    """Generate HTML overview of all runs."""
-    
-    # Group by date
-    by_date: Dict[str, List[Dict[str, Any]]] = {}
-    for result in results:
-        timestamp = result.get('timestamp_utc', '')
-        date = timestamp.split('T')[0] if 'T' in timestamp else 'unknown'
-        if date not in by_date:
-            by_date[date] = []
-        by_date[date].append(result)
-    
-    # Sort dates
-    sorted_dates = sorted(by_date.keys(), reverse=True)
-    prompt_names = sorted({r.get('prompt_name') for r in results if r.get('prompt_name')})
-    
-    html = f"""<!DOCTYPE html>
-<html lang="de">
+OVERVIEW_HEAD = """<html lang="de">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>Trading Signals - Alle Runs</title>
     <style>
-        * {{
+        * {
             margin: 0;
             padding: 0;
             box-sizing: border-box;
-        }}
+        }
         
-        body {{
+        body {
             font-family: "Avenir Next", "Avenir", "Gill Sans", "Trebuchet MS", sans-serif;
             background: linear-gradient(135deg, #0b4f6c 0%, #0f766e 100%);
             padding: 20px;
             min-height: 100vh;
-        }}
+        }
         
-        .container {{
+        .container {
             max-width: 1600px;
             margin: 0 auto;
             background: white;
             border-radius: 12px;
             box-shadow: 0 20px 60px rgba(0,0,0,0.3);
             overflow: hidden;
-        }}
+        }
         
-        .header {{
+        .header {
             background: linear-gradient(135deg, #0b4f6c 0%, #0f766e 100%);
             color: white;
             padding: 30px;
             text-align: center;
-        }}
+        }
         
-        .header h1 {{
+        .header h1 {
             font-size: 2.5em;
             margin-bottom: 10px;
-        }}
+        }
         
-        .controls {{
+        .controls {
             padding: 20px 30px 10px;
             background: #f5f7f9;
             border-bottom: 1px solid #e2e8f0;
-        }}
+        }
 
-        .filters {{
+        .filters {
             display: grid;
             grid-template-columns: repeat(auto-fit, minmax(220px, 1fr));
             gap: 12px;
             align-items: end;
-        }}
+        }
 
-        .filter-group label {{
+        .filter-group label {
             display: block;
             font-size: 0.85em;
             color: #475569;
             margin-bottom: 6px;
             font-weight: 600;
-        }}
+        }
 
-        .filter-group select {{
+        .filter-group select {
             width: 100%;
             padding: 10px 12px;
             border-radius: 8px;
             border: 1px solid #cbd5f5;
             background: white;
             font-size: 0.95em;
-        }}
+        }
 
-        .filter-actions {{
+        .filter-actions {
             display: flex;
             gap: 10px;
             align-items: center;
-        }}
+        }
 
-        .filter-actions button {{
+        .filter-actions button {
             border: 0;
             border-radius: 999px;
             padding: 10px 14px;
@@ -137,68 +121,68 @@ def generate_overview_html(results: List[Dict[str, Any]], output_path: Path) ->
             cursor: pointer;
             background: #0b4f6c;
             color: white;
-        }}
+        }
 
-        .filter-actions button.secondary {{
+        .filter-actions button.secondary {
             background: #e2e8f0;
             color: #0f172a;
-        }}
+        }
 
-        .stats {{
+        .stats {
             display: grid;
             grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
             gap: 15px;
             padding: 30px;
             background: #f8f9fa;
-        }}
+        }
         
-        .stat-card {{
+        .stat-card {
             background: white;
             padding: 20px;
             border-radius: 8px;
             box-shadow: 0 2px 4px rgba(0,0,0,0.1);
             animation: rise 0.6s ease both;
-        }}
+        }
         
-        .stat-card .label {{
+        .stat-card .label {
             font-size: 0.9em;
             color: #6c757d;
             margin-bottom: 8px;
-        }}
+        }
         
-        .stat-card .value {{
+        .stat-card .value {
             font-size: 2em;
             font-weight: bold;
             color: #212529;
-        }}
+        }
         
-        .date-section {{
+        .date-section {
             margin: 30px;
             border: 1px solid #dee2e6;
             border-radius: 8px;
             overflow: hidden;
             animation: rise 0.6s ease both;
-        }}
+        }
         
-        .date-header {{
+        .date-header {
             background: #f8f9fa;
             padding: 15px 20px;
             font-weight: 600;
             font-size: 1.2em;
             border-bottom: 2px solid #dee2e6;
-        }}
+        }
         
-        .table-container {{
+        .table-container {
             overflow-x: auto;
-        }}
+        }
         
-        table {{
+        table {
             width: 100%;
             border-collapse: collapse;
             font-size: 13px;
-        }}
+        }
         
-        th {{
+        th {
             padding: 12px;
             text-align: left;
             font-weight: 600;
@@ -206,122 +190,62 @@ def generate_overview_html(results: List[Dict[str, Any]], output_path: Path) ->
             border-bottom: 2px solid #dee2e6;
             position: sticky;
             top: 0;
-        }}
+        }
         
-        td {{
+        td {
             padding: 10px 12px;
             border-bottom: 1px solid #e9ecef;
-        }}
+        }
         
-        tbody tr:hover {{
+        tbody tr:hover {
             background-color: #f8f9fa;
-        }}
+        }
         
-        .signal-badge {{
+        .signal-badge {
             display: inline-block;
             padding: 4px 10px;
             border-radius: 12px;
             font-weight: 600;
             font-size: 0.85em;
             color: white;
-        }}
+        }
         
-        .signal-BUY {{ background-color: #10b981; }}
-        .signal-SELL {{ background-color: #ef4444; }}
-        .signal-HOLD {{ background-color: #6b7280; }}
+        .signal-BUY { background-color: #10b981; }
+        .signal-SELL { background-color: #ef4444; }
+        .signal-HOLD { background-color: #6b7280; }
         
-        .text-cell {{
+        .text-cell {
             max-width: 400px;
             word-wrap: break-word;
             line-height: 1.4;
             font-size: 0.9em;
-        }}
-
-        @keyframes rise {{
-            from {{ transform: translateY(10px); opacity: 0; }}
-            to {{ transform: translateY(0); opacity: 1; }}
-        }}
-
-        @media (max-width: 900px) {{
-            .date-section {{ margin: 20px; }}
-            .stats {{ padding: 20px; }}
-            .controls {{ padding: 20px; }}
-        }}
-    </style>
-</head>
-<body>
-    <div class="container">
-        <div class="header">
-            <h1>📊 Trading Signals - Alle Runs</h1>
-            <p>Übersicht über alle bisherigen Analysen</p>
-        </div>
+        }
 
-        <div class="controls">
-            <div class="filters">
-                <div class="filter-group">
-                    <label for="promptFilter">Prompt</label>
-                    <select id="promptFilter">
-                        <option value="ALL">Alle Prompts</option>
-                        {"".join([f'<option value="{name}">{name}</option>' for name in prompt_names])}
-                    </select>
-                </div>
-                <div class="filter-group">
-                    <label for="signalFilter">Signal</label>
-                    <select id="signalFilter">
-                        <option value="ALL">Alle Signale</option>
-                        <option value="BUY">BUY</option>
-                        <option value="SELL">SELL</option>
-                        <option value="HOLD">HOLD</option>
-                    </select>
-                </div>
-                <div class="filter-group">
-                    <label for="dateFilter">Tag</label>
-                    <select id="dateFilter">
-                        <option value="ALL">Alle Tage</option>
-                        {"".join([f'<option value="{d}">{d}</option>' for d in sorted_dates])}
-                    </select>
-                </div>
-                <div class="filter-actions">
-                    <button id="applyFilters" type="button">Filtern</button>
-                    <button id="resetFilters" class="secondary" type="button">Zurücksetzen</button>
-                </div>
-            </div>
-        </div>
-        
-        <div class="stats">
-            <div class="stat-card">
-                <div class="label">Gesamt Signale</div>
-                <div class="value" id="kpiTotal">{len(results)}</div>
-            </div>
-            <div class="stat-card">
-                <div class="label">BUY Signale</div>
-                <div class="value" id="kpiBuy" style="color: #10b981;">{sum(1 for r in results if r.get('signal') == 'BUY')}</div>
-            </div>
-            <div class="stat-card">
-                <div class="label">SELL Signale</div>
-                <div class="value" id="kpiSell" style="color: #ef4444;">{sum(1 for r in results if r.get('signal') == 'SELL')}</div>
-            </div>
-            <div class="stat-card">
-                <div class="label">HOLD Signale</div>
-                <div class="value" id="kpiHold" style="color: #6b7280;">{sum(1 for r in results if r.get('signal') == 'HOLD')}</div>
-            </div>
-            <div class="stat-card">
-                <div class="label">Anzahl Tage</div>
-                <div class="value" id="kpiDays">{len(sorted_dates)}</div>
-            </div>
-            <div class="stat-card">
-                <div class="label">BUY/SELL Ratio</div>
-                <div class="value" id="kpiRatio">-</div>
-            </div>
-        </div>
+        @keyframes rise {
+            from { transform: translateY(10px); opacity: 0; }
+            to { transform: translateY(0); opacity: 1; }
+        }
+
+        @media (max-width: 900px) {
+            .date-section { margin: 20px; }
+            .stats { padding: 20px; }
+            .controls { padding: 20px; }
+        }
+
+        /* Filters are applied by setting data-fp/data-fs on <html> */
+        html[data-fs="BUY"] tbody tr:not([data-signal="BUY"]),
+        html[data-fs="SELL"] tbody tr:not([data-signal="SELL"]),
+        html[data-fs="HOLD"] tbody tr:not([data-signal="HOLD"]),
+        body.filtered .date-section.filtered-out {
+            display: none;
+        }
 """
-    
-    for date in sorted_dates:
-        date_results = by_date[date]
-        html += f"""
-        <div class="date-section">
+
+# One date section; rows are filled in by the script from the embedded JSON
+SECTION_TEMPLATE = """
+        <div class="date-section" data-date="{date}">
             <div class="date-header">
-                📅 {date} ({len(date_results)} Signale)
+                📅 {date} ({count} Signale)
             </div>
             <div class="table-container">
                 <table>
@@ -339,35 +263,13 @@ def generate_overview_html(results: List[Dict[str, Any]], output_path: Path) ->
                             <th>Zeitpunkt</th>
                         </tr>
                     </thead>
-                    <tbody>
-"""
-        for result in sorted(date_results, key=lambda x: (x.get('symbol', ''), x.get('prompt_name', ''))):
-            signal = result.get('signal', 'HOLD')
-            rationale = result.get('rationale', '-') or '-'
-            invalidation = result.get('invalidation', '-') or '-'
-            html += f"""
-                        <tr data-date="{date}" data-signal="{signal}" data-prompt="{result.get('prompt_name', '-')}">
-                            <td><strong>{result.get('symbol', '-')}</strong></td>
-                            <td>{result.get('prompt_name', '-')}</td>
-                            <td><span class="signal-badge signal-{signal}">{signal}</span></td>
-                            <td>{result.get('confidence', 0):.2f}</td>
-                            <td>{result.get('entry') or '-'}</td>
-                            <td>{result.get('stop') or '-'}</td>
-                            <td>{', '.join([str(t) for t in result.get('targets', [])]) or '-'}</td>
-                            <td class="text-cell">{rationale}</td>
-                            <td class="text-cell">{invalidation}</td>
-                            <td style="font-size: 0.85em; color: #6c757d;">{result.get('timestamp_utc', '-')}</td>
-                        </tr>
-"""
-        html += """
-                    </tbody>
+                    <tbody></tbody>
                 </table>
             </div>
         </div>
 """
-    
-    html += """
-    </div>
+
+OVERVIEW_FOOTER = """
     <script>
         const promptFilter = document.getElementById('promptFilter');
         const signalFilter = document.getElementById('signalFilter');
@@ -382,52 +284,107 @@ def generate_overview_html(results: List[Dict[str, Any]], output_path: Path) ->
         const kpiDays = document.getElementById('kpiDays');
         const kpiRatio = document.getElementById('kpiRatio');
 
+        const sections = Array.from(document.querySelectorAll('.date-section'));
+        const aggregates = JSON.parse(document.getElementById('overviewAggregates').textContent);
+        const rootData = document.documentElement.dataset;
+        const initialKpis = [kpiTotal, kpiBuy, kpiSell, kpiHold, kpiDays, kpiRatio].map((element) => [element, element.textContent]);
+
+        function countFor(prompt, signal, date) {
+            const bySignal = aggregates.counts[prompt];
+            const byDate = bySignal && bySignal[signal];
+            return (byDate && byDate[date]) || 0;
+        }
+
+        // Rows are built from the embedded JSON the first time their date section scrolls into view
+        const sectionRows = JSON.parse(document.getElementById('overviewRows').textContent);
+        const rowTemplate = document.getElementById('overviewRowTemplate').content.firstElementChild;
+
+        function renderSection(section) {
+            if (section.dataset.rendered) {
+                return;
+            }
+            section.dataset.rendered = '1';
+            const date = section.dataset.date;
+            const fragment = document.createDocumentFragment();
+            for (const values of sectionRows[date] || []) {
+                const row = rowTemplate.cloneNode(true);
+                const cells = row.cells;
+                row.dataset.date = date;
+                row.dataset.prompt = values[1];
+                row.dataset.signal = values[2];
+                cells[0].firstElementChild.textContent = values[0];
+                cells[1].textContent = values[1];
+                const badge = cells[2].firstElementChild;
+                badge.textContent = values[2];
+                badge.classList.add('signal-' + values[2]);
+                for (let i = 3; i < values.length; i += 1) {
+                    cells[i].textContent = values[i];
+                }
+                fragment.appendChild(row);
+            }
+            section.querySelector('tbody').appendChild(fragment);
+        }
+
+        if ('IntersectionObserver' in window) {
+            const sectionObserver = new IntersectionObserver((entries) => {
+                entries.forEach((entry) => {
+                    if (entry.isIntersecting) {
+                        renderSection(entry.target);
+                        sectionObserver.unobserve(entry.target);
+                    }
+                });
+            }, { rootMargin: '400px 0px' });
+            sections.forEach((section) => sectionObserver.observe(section));
+        } else {
+            sections.forEach(renderSection);
+        }
+
         function applyFilters() {
             const promptValue = promptFilter.value;
             const signalValue = signalFilter.value;
             const dateValue = dateFilter.value;
 
-            let visibleCount = 0;
+            // Row visibility is handled by CSS rules keyed on these attributes
+            rootData.fp = promptValue === 'ALL' ? '' : promptValue;
+            rootData.fs = signalValue === 'ALL' ? '' : signalValue;
+
+            if (promptValue === 'ALL' && signalValue === 'ALL' && dateValue === 'ALL') {
+                // Unfiltered view: show every section with one class flip and restore the KPIs rendered by Python
+                document.body.classList.remove('filtered');
+                initialKpis.forEach(([element, text]) => {
+                    element.textContent = text;
+                });
+                return;
+            }
+            document.body.classList.add('filtered');
+
+            const visibleCount = countFor(promptValue, signalValue, dateValue);
             const signalCounts = { BUY: 0, SELL: 0, HOLD: 0 };
-            const visibleDates = new Set();
-
-            document.querySelectorAll('tbody tr').forEach((row) => {
-                const rowPrompt = row.dataset.prompt;
-                const rowSignal = row.dataset.signal;
-                const rowDate = row.dataset.date;
-
-                const matchPrompt = promptValue === 'ALL' || rowPrompt === promptValue;
-                const matchSignal = signalValue === 'ALL' || rowSignal === signalValue;
-                const matchDate = dateValue === 'ALL' || rowDate === dateValue;
-
-                if (matchPrompt && matchSignal && matchDate) {
-                    row.style.display = '';
-                    visibleCount += 1;
-                    if (signalCounts[rowSignal] !== undefined) {
-                        signalCounts[rowSignal] += 1;
-                    }
-                    visibleDates.add(rowDate);
-                } else {
-                    row.style.display = 'none';
+            for (const signal in signalCounts) {
+                if (signalValue === 'ALL' || signalValue === signal) {
+                    signalCounts[signal] = countFor(promptValue, signal, dateValue);
                 }
-            });
+            }
+            let visibleDays;
+            if (dateValue === 'ALL') {
+                const daysBySignal = aggregates.days[promptValue];
+                visibleDays = (daysBySignal && daysBySignal[signalValue]) || 0;
+            } else {
+                visibleDays = visibleCount > 0 ? 1 : 0;
+            }
 
-            document.querySelectorAll('.date-section').forEach((section) => {
-                const rows = section.querySelectorAll('tbody tr');
-                let anyVisible = false;
-                rows.forEach((row) => {
-                    if (row.style.display !== 'none') {
-                        anyVisible = true;
-                    }
-                });
-                section.style.display = anyVisible ? '' : 'none';
+            sections.forEach((section) => {
+                const sectionDate = section.dataset.date;
+                const visible = (dateValue === 'ALL' || sectionDate === dateValue)
+                    && countFor(promptValue, signalValue, sectionDate) > 0;
+                section.classList.toggle('filtered-out', !visible);
             });
 
             kpiTotal.textContent = visibleCount;
             kpiBuy.textContent = signalCounts.BUY;
             kpiSell.textContent = signalCounts.SELL;
             kpiHold.textContent = signalCounts.HOLD;
-            kpiDays.textContent = visibleDates.size;
+            kpiDays.textContent = visibleDays;
             if (signalCounts.SELL > 0) {
                 kpiRatio.textContent = (signalCounts.BUY / signalCounts.SELL).toFixed(2);
             } else if (signalCounts.BUY > 0) {
@@ -444,19 +401,322 @@ def generate_overview_html(results: List[Dict[str, Any]], output_path: Path) ->
             dateFilter.value = 'ALL';
             applyFilters();
         });
-
-        applyFilters();
     </script>
 </body>
 </html>"""
+
+
+def _css_string(value: str) -> str:
+    """Escape a value for use inside a double-quoted CSS attribute selector."""
+    return value.replace('\\', '\\\\').replace('"', '\\"')
+
+
+def _json_for_script(obj: Any) -> str:
+    """Serialize obj for embedding in a <script type="application/json"> block."""
+    # Escaping every "<" keeps "</script>" and "<!--" in model text inert
+    return json_dumps(obj).replace('<', '\\u003c')
+
+
+def _load_result_file(path: str) -> Optional[List[Dict[str, Any]]]:
+    """Load the results stored in a single _all.json file, or None if it is unreadable."""
+    try:
+        # Unbuffered: the whole file is read in one go, so skip the BufferedReader layer
+        with open(path, 'rb', buffering=0) as f:
+            results = json_loads(f.readall())
+    except Exception as e:
+        print(f"Warning: Could not load {path}: {e}")
+        return None
+    return results if isinstance(results, list) else [results]
+
+
+def _read_results_cache() -> Dict[str, Tuple[Tuple[int, int], List[Dict[str, Any]]]]:
+    """Read the parsed-results cache: path -> ((size, mtime_ns), results)."""
+    try:
+        with RESULTS_CACHE_PATH.open("rb") as f:
+            cache = pickle.load(f)
+    except FileNotFoundError:
+        return {}
+    except Exception as e:
+        print(f"Warning: Ignoring unreadable cache {RESULTS_CACHE_PATH}: {e}")
+        return {}
+    return cache if isinstance(cache, dict) else {}
+
+
+def _write_results_cache(cache: Dict[str, Tuple[Tuple[int, int], List[Dict[str, Any]]]]) -> None:
+    """Persist the parsed-results cache, replacing the old file atomically."""
+    tmp_path = RESULTS_CACHE_PATH.with_suffix(".tmp")
+    try:
+        with tmp_path.open("wb") as f:
+            pickle.dump(cache, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, RESULTS_CACHE_PATH)
+    except Exception as e:
+        print(f"Warning: Could not write cache {RESULTS_CACHE_PATH}: {e}")
+
+
+def find_result_files() -> List[str]:
+    """Return the paths of all _all.json files, ordered by day directory."""
+    with os.scandir(RUNS_DIR) as it:
+        day_dirs = sorted((entry for entry in it if entry.is_dir()), key=lambda entry: entry.name)
     
-    output_path.write_text(html, encoding="utf-8")
+    json_files: List[str] = []
+    for day_dir in day_dirs:
+        with os.scandir(day_dir.path) as it:
+            json_files.extend(entry.path for entry in it if entry.name.endswith("_all.json") and entry.is_file())
+    return json_files
+
+
+def compute_fingerprint(json_files: List[str]) -> str:
+    """Hash path, size and mtime of every input file (and this script) into a short hex digest."""
+    digest = hashlib.blake2b(digest_size=16)
+    for path in [__file__, *json_files]:
+        st = os.stat(path)
+        digest.update(f"{path}\0{st.st_size}\0{st.st_mtime_ns}\n".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def read_fingerprint(output_path: Path) -> Optional[str]:
+    """Return the fingerprint embedded in an existing overview, if any."""
+    try:
+        with output_path.open("rb") as f:
+            head = f.read(200).decode("utf-8", errors="ignore")
+    except OSError:
+        return None
+    match = FINGERPRINT_RE.search(head)
+    return match.group(1) if match else None
+
+
+def load_all_results(
+    json_files: Optional[List[str]] = None,
+    preloaded: Optional[Dict[str, List[Dict[str, Any]]]] = None,
+) -> List[Dict[str, Any]]:
+    """Load all results from all run directories.
+
+    Parsed files are cached by (size, mtime_ns), so only new or changed
+    files are read again. preloaded maps paths to results the caller already
+    holds in memory (e.g. the run that just wrote them); those are not parsed.
+    """
+    all_results = []
+    
+    if json_files is None:
+        json_files = find_result_files()
+    if not json_files:
+        return all_results
+    
+    cache = _read_results_cache()
+    fresh_cache: Dict[str, Tuple[Tuple[int, int], List[Dict[str, Any]]]] = {}
+    stale: List[Tuple[str, Tuple[int, int]]] = []
+    reused = False
+    for path in json_files:
+        st = os.stat(path)
+        key = (st.st_size, st.st_mtime_ns)
+        cached = cache.get(path)
+        if cached is not None and cached[0] == key:
+            fresh_cache[path] = cached
+        elif preloaded and path in preloaded:
+            fresh_cache[path] = (key, preloaded[path])
+            reused = True
+        else:
+            stale.append((path, key))
+    
+    if stale:
+        # Reads are IO-bound, so overlap them in threads; map() keeps file order
+        with ThreadPoolExecutor(max_workers=min(32, len(stale))) as executor:
+            loaded = executor.map(_load_result_file, [path for path, _ in stale])
+            for (path, key), results in zip(stale, loaded):
+                if results is not None:
+                    fresh_cache[path] = (key, results)
+    
+    if stale or reused or fresh_cache.keys() != cache.keys():
+        _write_results_cache(fresh_cache)
+    
+    for path in json_files:
+        cached = fresh_cache.get(path)
+        if cached is not None:
+            all_results.extend(cached[1])
+    
+    return all_results
+
+
+def generate_overview_html(
+    results: List[Dict[str, Any]],
+    output_path: Path,
+    fingerprint: Optional[str] = None,
+) -> None:
+    """Generate HTML overview of all runs.
+
+    If fingerprint is given it is embedded as a comment so that main() can
+    skip regeneration while the inputs are unchanged.
+    """
+    
+    # Tag each result with its date and collect KPI counts in a single pass
+    dated: List[Tuple[str, str, Dict[str, Any]]] = []
+    date_counts: Counter = Counter()
+    signal_counts: Counter = Counter()
+    prompt_name_set = set()
+    # prompt -> signal -> date -> count, with 'ALL' marginals on every axis,
+    # so the filter script reads each KPI with a single lookup
+    kpi_counts: Dict[str, Dict[str, Dict[str, int]]] = {}
+    for result in results:
+        # ISO-8601 timestamps are fixed-width: YYYY-MM-DDTHH:MM:SS...
+        timestamp = result.get('timestamp_utc') or ''
+        date = timestamp[:10] if timestamp[10:11] == 'T' else 'unknown'
+        # One display name for the cube, the sort and the row, so null names neither
+        # break the JSON encoding nor end up under a different key than their row
+        prompt = str(result.get('prompt_name') or '-')
+        dated.append((date, prompt, result))
+        date_counts[date] += 1
+        signal = result.get('signal') or 'HOLD'
+        signal_counts[signal] += 1
+        if result.get('prompt_name'):
+            prompt_name_set.add(prompt)
+        for prompt_key in (prompt, 'ALL'):
+            by_signal = kpi_counts.setdefault(prompt_key, {})
+            for signal_key in (signal, 'ALL'):
+                by_date = by_signal.setdefault(signal_key, {})
+                for date_key in (date, 'ALL'):
+                    by_date[date_key] = by_date.get(date_key, 0) + 1
+    
+    # Sort once: newest date first, then symbol and prompt within each date
+    dated.sort(key=lambda item: (str(item[2].get('symbol') or ''), item[1]))
+    dated.sort(key=itemgetter(0), reverse=True)
+    sorted_dates = sorted(date_counts, reverse=True)
+    # Same formatting as the filter script, so the unfiltered KPIs can be rendered here
+    if signal_counts['SELL'] > 0:
+        signal_ratio = f"{signal_counts['BUY'] / signal_counts['SELL']:.2f}"
+    elif signal_counts['BUY'] > 0:
+        signal_ratio = '∞'
+    else:
+        signal_ratio = '0'
+    kpi_days = {
+        prompt_key: {signal_key: len(by_date) - 1 for signal_key, by_date in by_signal.items()}
+        for prompt_key, by_signal in kpi_counts.items()
+    }
+    prompt_names = sorted(prompt_name_set)
+    prompt_filter_css = "".join(
+        f'        html[data-fp="{_css_string(name)}"] tbody tr:not([data-prompt="{_css_string(name)}"]) {{ display: none; }}\n'
+        for name in prompt_names
+    )
+    
+    # Render into a temp file and swap it in only once complete, so a failed or
+    # interrupted render never leaves a truncated page carrying a valid fingerprint
+    tmp_path = output_path.with_suffix(".tmp")
+    with tmp_path.open("w", encoding="utf-8", buffering=1024 * 1024) as out:
+        write = out.write
+        write("<!DOCTYPE html>\n")
+        if fingerprint:
+            write(f"<!-- fingerprint: {fingerprint} -->\n")
+        write(OVERVIEW_HEAD)
+        write(prompt_filter_css)
+        write(f"""    </style>
+</head>
+<body>
+    <div class="container">
+        <div class="header">
+            <h1>📊 Trading Signals - Alle Runs</h1>
+            <p>Übersicht über alle bisherigen Analysen</p>
+        </div>
+
+        <div class="controls">
+            <div class="filters">
+                <div class="filter-group">
+                    <label for="promptFilter">Prompt</label>
+                    <select id="promptFilter">
+                        <option value="ALL">Alle Prompts</option>
+                        {"".join(f'<option value="{name}">{name}</option>' for name in map(escape, prompt_names))}
+                    </select>
+                </div>
+                <div class="filter-group">
+                    <label for="signalFilter">Signal</label>
+                    <select id="signalFilter">
+                        <option value="ALL">Alle Signale</option>
+                        <option value="BUY">BUY</option>
+                        <option value="SELL">SELL</option>
+                        <option value="HOLD">HOLD</option>
+                    </select>
+                </div>
+                <div class="filter-group">
+                    <label for="dateFilter">Tag</label>
+                    <select id="dateFilter">
+                        <option value="ALL">Alle Tage</option>
+                        {"".join(f'<option value="{d}">{d}</option>' for d in map(escape, sorted_dates))}
+                    </select>
+                </div>
+                <div class="filter-actions">
+                    <button id="applyFilters" type="button">Filtern</button>
+                    <button id="resetFilters" class="secondary" type="button">Zurücksetzen</button>
+                </div>
+            </div>
+        </div>
+        
+        <div class="stats">
+            <div class="stat-card">
+                <div class="label">Gesamt Signale</div>
+                <div class="value" id="kpiTotal">{len(results)}</div>
+            </div>
+            <div class="stat-card">
+                <div class="label">BUY Signale</div>
+                <div class="value" id="kpiBuy" style="color: #10b981;">{signal_counts['BUY']}</div>
+            </div>
+            <div class="stat-card">
+                <div class="label">SELL Signale</div>
+                <div class="value" id="kpiSell" style="color: #ef4444;">{signal_counts['SELL']}</div>
+            </div>
+            <div class="stat-card">
+                <div class="label">HOLD Signale</div>
+                <div class="value" id="kpiHold" style="color: #6b7280;">{signal_counts['HOLD']}</div>
+            </div>
+            <div class="stat-card">
+                <div class="label">Anzahl Tage</div>
+                <div class="value" id="kpiDays">{len(sorted_dates)}</div>
+            </div>
+            <div class="stat-card">
+                <div class="label">BUY/SELL Ratio</div>
+                <div class="value" id="kpiRatio">{signal_ratio}</div>
+            </div>
+        </div>
+""")
+        
+        # Rows are shipped as JSON per date and rendered by the script on demand
+        section_rows: Dict[str, List[List[str]]] = {}
+        for date, date_results in groupby(dated, key=itemgetter(0)):
+            write(SECTION_TEMPLATE.format_map({'date': escape(date), 'count': date_counts[date]}))
+            rows = section_rows[date] = []
+            for _, prompt, result in date_results:
+                get = result.get
+                targets = get('targets', [])
+                rows.append([
+                    str(get('symbol', '-')),
+                    prompt,
+                    get('signal') or 'HOLD',
+                    f"{get('confidence', 0):.2f}",
+                    str(get('entry') or '-'),
+                    str(get('stop') or '-'),
+                    ', '.join(map(str, targets)) if targets else '-',
+                    get('rationale', '-') or '-',
+                    get('invalidation', '-') or '-',
+                    str(get('timestamp_utc', '-')),
+                ])
+        
+        write(f"""
+    </div>
+    <template id="overviewRowTemplate"><tr><td><strong></strong></td><td></td><td><span class="signal-badge"></span></td><td></td><td></td><td></td><td></td><td class="text-cell"></td><td class="text-cell"></td><td style="font-size: 0.85em; color: #6c757d;"></td></tr></template>
+    <script type="application/json" id="overviewRows">{_json_for_script(section_rows)}</script>
+    <script type="application/json" id="overviewAggregates">{_json_for_script({'counts': kpi_counts, 'days': kpi_days})}</script>""")
+        write(OVERVIEW_FOOTER)
+    os.replace(tmp_path, output_path)
 
 
 def main():
     """Main function."""
+    output_path = BASE_DIR / "runs" / "all_runs_overview.html"
+    json_files = find_result_files()
+    fingerprint = compute_fingerprint(json_files)
+    if read_fingerprint(output_path) == fingerprint:
+        print(f"✓ Overview up to date: {output_path}")
+        return
+    
     print("Loading all results...")
-    all_results = load_all_results()
+    all_results = load_all_results(json_files)
     
     if not all_results:
         print("No results found!")
@@ -464,8 +724,7 @@ def main():
     
     print(f"Found {len(all_results)} results")
     
-    output_path = BASE_DIR / "runs" / "all_runs_overview.html"
-    generate_overview_html(all_results, output_path)
+    generate_overview_html(all_results, output_path, fingerprint=fingerprint)
     
     print(f"✓ Overview generated: {output_path}")
 
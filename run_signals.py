@@ -1,14 +1,63 @@
 import os
+import re
+import sys
 import json
+import hashlib
 import time
 import random
-from dataclasses import dataclass
+import asyncio
+import contextlib
+import functools
+from collections import Counter
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple, Union
 
 import httpx
-from openai import OpenAI
+import openai
+from openai import AsyncOpenAI
+
+try:
+    import orjson
+    json_loads = orjson.loads
+
+    def json_dumps(obj: Any) -> str:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+
+    def json_dump_bytes(obj: Any, pretty: bool = True) -> bytes:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if pretty else 0)
+        return orjson.dumps(obj, option=option)
+except ImportError:
+    json_loads = json.loads
+
+    def json_dumps(obj: Any) -> str:
+        return json.dumps(obj, ensure_ascii=False, separators=(',', ':'))
+
+    def json_dump_bytes(obj: Any, pretty: bool = True) -> bytes:
+        if pretty:
+            return json.dumps(obj, ensure_ascii=False, indent=2).encode("utf-8")
+        return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode("utf-8")
+
+try:
+    import fastjsonschema
+except ImportError:  # optional: responses are then only checked by the API's strict mode
+    fastjsonschema = None
+
+# Sibling script next to this file; put its directory on sys.path once so the
+# import also works when this module is loaded via importlib or from a package
+_SCRIPT_DIR = str(Path(__file__).resolve().parent)
+if _SCRIPT_DIR not in sys.path:
+    sys.path.insert(0, _SCRIPT_DIR)
+try:
+    from generate_all_reports import (
+        compute_fingerprint,
+        find_result_files,
+        generate_overview_html,
+        load_all_results,
+    )
+except ImportError:  # the per-run reports are still written, only the overview is skipped
+    generate_overview_html = None
 
 # -----------------------------
 # Configuration
@@ -22,6 +71,34 @@ RUNS_DIR = BASE_DIR / "runs"
 TWELVEDATA_API_KEY = os.getenv("TWELVEDATA_API_KEY", "")
 TWELVEDATA_BASE_URL = "https://api.twelvedata.com"
 
+# Price cache: runs inside the same minute reuse one TwelveData quote
+PRICE_CACHE_PATH = BASE_DIR / ".price_cache.json"
+PRICE_CACHE_TTL_SECONDS = 60
+# Failed lookups are remembered briefly so repeated runs don't hammer the API
+PRICE_NEGATIVE_TTL_SECONDS = 15
+# In-process quotes, checked before the disk cache: symbol -> (monotonic time, quote)
+PRICE_MEMORY_TTL_SECONDS = 30
+_PRICE_MEMO: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+
+# Pip size per symbol used by get_pip_value; others are inferred
+PIP_VALUES: Dict[str, float] = {
+    "AUDJPY": 1.00,
+    "EURUSD": 0.0100,
+    "XAUUSD": 10.00,
+    "GBPUSD": 0.0100,
+    "GBPJPY": 1.00,
+    "AUDUSD": 0.0100,
+    "EURJPY": 1.00,
+    "NZDUSD": 0.0100,
+    "CADJPY": 1.00,
+    "CHFJPY": 1.00,
+    "USDJPY": 1.00,
+}
+
+# Shared HTTP clients, see get_twelvedata_client() / get_openai_client()
+_TD_CLIENT: Optional[httpx.AsyncClient] = None
+_OPENAI_CLIENT: Optional[AsyncOpenAI] = None
+
 # Optional: Study parameters
 ALLOWED_SYMBOLS = {"EURUSD", "AUDJPY"}
 SYMBOLS_STR = os.getenv("STUDY_SYMBOLS", "EURUSD,AUDJPY")
@@ -42,6 +119,39 @@ RUN_TIMES_LOCAL = os.getenv("STUDY_RUN_TIMES_LOCAL", "10:00,15:00")
 
 MARKET_DATA_JSON_PATH = os.getenv("MARKET_DATA_JSON_PATH", "")
 
+# Answer all prompts for a symbol in one request instead of one request per prompt
+OPENAI_BATCH_PROMPTS = os.getenv("OPENAI_BATCH_PROMPTS", "").lower() in ("1", "true", "yes")
+
+# Maximum number of OpenAI requests in flight at once
+OPENAI_MAX_CONCURRENCY = max(1, int(os.getenv("OPENAI_MAX_CONCURRENCY", "4")))
+
+# OpenAI rate limits shared by all requests in a run (token-bucket throttling)
+MAX_REQUESTS_PER_MINUTE = float(os.getenv("MAX_REQUESTS_PER_MINUTE", "500"))
+MAX_TOKENS_PER_MINUTE = float(os.getenv("MAX_TOKENS_PER_MINUTE", "200000"))
+# Completion tokens budgeted per request on top of the prompt estimate
+EXPECTED_COMPLETION_TOKENS = 500
+
+# Errors that will fail the same way on every attempt, so they are not retried
+NON_RETRYABLE_ERRORS = (
+    openai.BadRequestError,
+    openai.AuthenticationError,
+    openai.PermissionDeniedError,
+    openai.NotFoundError,
+    openai.UnprocessableEntityError,
+)
+
+# Errors that every other request in the run would hit too, so they abort the run
+# (as does an exhausted quota, see is_quota_error)
+FATAL_ERRORS = (
+    openai.AuthenticationError,
+    openai.PermissionDeniedError,
+)
+
+# Opt-in: reuse model responses for identical requests on the same price quote
+# for this many seconds (0 disables); reused results are saved with "cached": true
+LLM_CACHE_DIR = BASE_DIR / ".llm_cache"
+LLM_CACHE_TTL_SECONDS = int(os.getenv("LLM_CACHE_TTL_SECONDS", "0"))
+
 
 # -----------------------------
 # JSON Schema for structured output
@@ -52,9 +162,6 @@ SIGNAL_SCHEMA: Dict[str, Any] = {
         "type": "object",
         "additionalProperties": False,
         "properties": {
-            "symbol": {"type": "string"},
-            "timeframe": {"type": "string"},
-            "timestamp_utc": {"type": "string"},
             "signal": {"type": "string", "enum": ["BUY", "SELL", "HOLD"]},
             "confidence": {"type": "number", "minimum": 0, "maximum": 1},
             "entry": {"type": ["number", "null"]},
@@ -66,19 +173,102 @@ SIGNAL_SCHEMA: Dict[str, Any] = {
             },
             "rationale": {"type": "string"},
             "invalidation": {"type": "string"},
-            "prompt_name": {"type": "string"},
-            "raw_notes": {"type": "string"},
-            "current_price": {"type": ["number", "null"]},
-            "entry_distance_pips": {"type": ["number", "null"]}
+            "raw_notes": {"type": "string"}
         },
+        # symbol, timeframe, timestamp_utc, prompt_name, current_price and
+        # entry_distance_pips are known locally and added after the call
         "required": [
-            "symbol", "timeframe", "timestamp_utc", "signal", "confidence",
-            "entry", "stop", "targets", "rationale", "invalidation",
-            "prompt_name", "raw_notes", "current_price", "entry_distance_pips"
+            "signal", "confidence", "entry", "stop", "targets",
+            "rationale", "invalidation", "raw_notes"
         ],
     },
 }
 
+# Batched mode: all prompts for a symbol answered in one request.
+# Structured outputs need an object at the top level, so the signals are wrapped.
+BATCH_SIGNAL_SCHEMA: Dict[str, Any] = {
+    "name": "trading_signal_batch_output",
+    "schema": {
+        "type": "object",
+        "additionalProperties": False,
+        "properties": {
+            "signals": {
+                "type": "array",
+                "items": {
+                    **SIGNAL_SCHEMA["schema"],
+                    "properties": {
+                        "prompt_name": {"type": "string"},
+                        **SIGNAL_SCHEMA["schema"]["properties"],
+                    },
+                    "required": ["prompt_name", *SIGNAL_SCHEMA["schema"]["required"]],
+                },
+            },
+        },
+        "required": ["signals"],
+    },
+}
+
+# Compiled once and reused for every prompt/symbol result
+validate_signal = fastjsonschema.compile(SIGNAL_SCHEMA["schema"]) if fastjsonschema else None
+validate_signal_batch = fastjsonschema.compile(BATCH_SIGNAL_SCHEMA["schema"]) if fastjsonschema else None
+
+
+# -----------------------------
+# Model prompts
+# -----------------------------
+SYSTEM_PROMPT = (
+    "You are a trading signal analysis assistant for a study. "
+    "Do NOT provide investment advice. Your role is to analyze market conditions and provide actionable trading signals. "
+    "CRITICAL: You MUST use the REAL-TIME market price provided in the prompt. "
+    "NEVER invent or estimate prices - use ONLY the current_price provided. "
+    "SIGNAL GUIDELINES: "
+    "- Prefer BUY or SELL signals when there is any reasonable basis for a directional view. "
+    "- HOLD is acceptable ONLY when there is genuinely NO trade opportunity. "
+    "- Be decisive: if you can identify any trend, pattern, or market condition, provide a BUY or SELL signal. "
+    "ENTRY PRICE REQUIREMENTS (CRITICAL): "
+    "- Entry price MUST be within 100 PIPS of the CURRENT market price provided. "
+    "- For JPY pairs (AUDJPY): 100 pips = 1.00. "
+    "- For major pairs (EURUSD): 100 pips = 0.0100. "
+    "- For XAUUSD (Gold): 100 pips = 10.00. "
+    "- Entry must be close to current market price - maximum 100 pips away. "
+    "- If you cannot set an entry within 100 pips of current price, return HOLD. "
+    "- Use the EXACT current_price provided as reference. "
+    "TIMING REQUIREMENTS: "
+    "- Trades must be executable within the NEXT HOUR from the current timestamp. "
+    "- Entry prices must be realistic and achievable within 1 hour. "
+    "- Trades should be designed for short-term execution on the 5-minute timeframe. "
+    "- Maximum trade duration: 5 hours."
+)
+
+# Placeholders in prompt templates, e.g. {CURRENT_PRICE}
+PROMPT_VAR_RE = re.compile(r"\{(\w+)\}")
+
+# Task preamble for batched mode; each prompt follows under its own heading
+BATCH_TASK_INTRO = (
+    "Answer each of the following prompts independently. "
+    "Return exactly one signal per prompt in `signals`, with prompt_name set to the prompt's name.\n\n"
+)
+
+# Per-request user message, filled with str.format_map
+USER_PROMPT_TEMPLATE = (
+    "CURRENT DATE AND TIME:\n"
+    "- Date: {current_date} ({current_day})\n"
+    "- Time: {current_time}\n"
+    "- Timestamp UTC: {timestamp_utc}\n\n"
+    "REAL-TIME MARKET PRICE:\n"
+    "- Current market price = {current_price}\n"
+    "- Price source: {price_source}\n"
+    "- Price timestamp: {price_time}\n\n"
+    "TRADING PARAMETERS:\n"
+    "- Symbol: {symbol}\n"
+    "- Timeframe: {timeframe}\n"
+    "- Prompt: {prompt_name}\n"
+    "- Notes: {notes}\n\n"
+    "CRITICAL: Entry price MUST be within 100 pips of the current market price ({reference_price}). "
+    "Use this EXACT price as your reference. Do NOT estimate or invent prices.\n\n"
+    "TASK:\n{prompt}\n"
+)
+
 
 @dataclass
 class PromptSpec:
@@ -94,204 +284,49 @@ PROMPTS: List[PromptSpec] = [
 ]
 
 
-# -----------------------------
-# Helpers
-# -----------------------------
-def utc_now_iso() -> str:
-    return datetime.now(timezone.utc).replace(microsecond=0).isoformat()
-
-
-def safe_read_text(path: Path) -> str:
-    if not path.exists():
-        raise FileNotFoundError(f"Prompt file not found: {path}")
-    content = path.read_text(encoding="utf-8").strip()
-    if not content:
-        raise ValueError(f"Prompt file is empty: {path}")
-    return content
-
-
-def get_pip_value(symbol: str) -> float:
-    """Get pip value for a symbol."""
-    pip_values = {
-        "AUDJPY": 1.00,
-        "EURUSD": 0.0100,
-        "XAUUSD": 10.00,
-        "GBPUSD": 0.0100,
-        "GBPJPY": 1.00,
-        "AUDUSD": 0.0100,
-        "EURJPY": 1.00,
-        "NZDUSD": 0.0100,
-        "CADJPY": 1.00,
-        "CHFJPY": 1.00,
-        "USDJPY": 1.00,
-    }
-    # Default: try to infer from symbol
-    if "JPY" in symbol:
-        return 1.00
-    elif "XAU" in symbol or "GOLD" in symbol.upper():
-        return 10.00
-    else:
-        return 0.0100  # Default for major pairs
-
-
-def calculate_pip_distance(entry: Optional[float], current_price: Optional[float], symbol: str) -> Optional[float]:
-    """Calculate pip distance between entry and current price."""
-    if entry is None or current_price is None:
-        return None
-    
-    pip_value = get_pip_value(symbol)
-    distance = abs(entry - current_price)
-    pips = distance / pip_value
-    return round(pips, 2)
-
-
-def format_symbol_for_twelvedata(symbol: str) -> str:
-    """
-    Convert symbol format to TwelveData format.
-    EURUSD -> EUR/USD, AUDJPY -> AUD/JPY, etc.
-    """
-    # For XAUUSD (Gold), use XAU/USD
-    if symbol == "XAUUSD":
-        return "XAU/USD"
-    
-    # For other pairs, insert / after first 3 characters
-    if len(symbol) == 6:
-        return f"{symbol[:3]}/{symbol[3:]}"
-    
-    # If already has /, return as is
-    if "/" in symbol:
-        return symbol
-    
-    # Default: try to split at 3 chars
-    return symbol
-
-
-def fetch_current_market_data(symbol: str) -> Optional[Dict[str, Any]]:
-    """
-    Fetch current market data using TwelveData API.
-    Returns dict with current_price, timestamp, and price_source.
-    """
-    if not TWELVEDATA_API_KEY:
-        print(f"Warning: TWELVEDATA_API_KEY not set. Cannot fetch real-time data for {symbol}.")
-        return None
+@dataclass(frozen=True)
+class TimeCtx:
+    """Date/time strings for one run, formatted once and shared by every request."""
+    date_str: str
+    time_str: str
+    day_name: str
+    timestamp_utc: str
     
-    try:
-        # Format symbol for TwelveData (EURUSD -> EUR/USD)
-        formatted_symbol = format_symbol_for_twelvedata(symbol)
-        
-        url = f"{TWELVEDATA_BASE_URL}/price"
-        params = {
-            "symbol": formatted_symbol,
-            "apikey": TWELVEDATA_API_KEY
-        }
-        
-        with httpx.Client(trust_env=False, http2=False, timeout=10.0) as client:
-            response = client.get(url, params=params)
-            response.raise_for_status()
-            data = response.json()
-        
-        # Check for API errors
-        if "code" in data:
-            error_msg = data.get("message", "Unknown error")
-            print(f"Warning: TwelveData API error for {symbol} ({formatted_symbol}): {error_msg}")
-            return None
-        
-        # Extract price
-        if "price" not in data:
-            print(f"Warning: No price data in response for {symbol} ({formatted_symbol})")
-            return None
-        
-        current_price = float(data["price"])
-        timestamp = data.get("timestamp", int(time.time()))
-        
-        return {
-            "current_price": current_price,
-            "timestamp": timestamp,
-            "price_source": "TwelveData",
-            "symbol": symbol
-        }
-        
-    except httpx.HTTPError as e:
-        print(f"Warning: HTTP error fetching market data for {symbol}: {type(e).__name__}: {str(e)}")
-        return None
-    except (ValueError, KeyError) as e:
-        print(f"Warning: Invalid response format for {symbol}: {type(e).__name__}: {str(e)}")
-        return None
-    except Exception as e:
-        print(f"Warning: Could not fetch market data for {symbol}: {type(e).__name__}: {str(e)}")
-        return None
-
-
-def load_market_data() -> Optional[Dict[str, Any]]:
-    """Load market data from file if path is provided."""
-    if not MARKET_DATA_JSON_PATH:
-        return None
-    p = Path(MARKET_DATA_JSON_PATH)
-    if not p.exists():
-        raise FileNotFoundError(f"MARKET_DATA_JSON_PATH does not exist: {p}")
-    return json.loads(p.read_text(encoding="utf-8"))
-
-
-def render_prompt(template: str, variables: Dict[str, Any]) -> str:
-    """Simple template substitution via {KEY}"""
-    out = template
-    for k, v in variables.items():
-        out = out.replace("{" + k + "}", str(v))
-    return out
-
-
-def backoff_sleep(attempt: int) -> None:
-    """Exponential backoff with jitter"""
-    base = min(2 ** attempt, 30)
-    time.sleep(base + random.uniform(0, 0.7))
-
-
-def ensure_dirs() -> None:
-    RUNS_DIR.mkdir(parents=True, exist_ok=True)
-
+    @classmethod
+    def from_datetime(cls, current_datetime: datetime, timestamp_utc: str) -> "TimeCtx":
+        return cls(
+            date_str=current_datetime.strftime("%Y-%m-%d"),
+            time_str=current_datetime.strftime("%H:%M:%S UTC"),
+            day_name=current_datetime.strftime("%A"),
+            timestamp_utc=timestamp_utc,
+        )
 
-def save_json(path: Path, obj: Any) -> None:
-    path.write_text(json.dumps(obj, ensure_ascii=False, indent=2), encoding="utf-8")
 
+@dataclass
+class SymbolContext:
+    symbol: str
+    current_price: Optional[float]
+    price_source: str
+    price_timestamp: Optional[int]
+    variables: Dict[str, Any]
+    md_path: str
+    # Pip size from get_pip_value, looked up once per symbol
+    pip_value: float
+    # Markdown fragments for md_path, written in one go once the symbol is done
+    md_parts: List[str] = field(default_factory=list)
 
-def append_markdown(path: Path, md: str) -> None:
-    with path.open("a", encoding="utf-8") as f:
-        f.write(md.rstrip() + "\n")
 
+# -----------------------------
+# HTML report templates
+# -----------------------------
+SIGNAL_COLORS: Dict[str, str] = {
+    "BUY": "#10b981",
+    "SELL": "#ef4444",
+    "HOLD": "#6b7280",
+}
 
-def generate_html_report(results: List[Dict[str, Any]], output_path: Path, timestamp_utc: str, symbols: List[str], timeframe: str) -> None:
-    """Generate an HTML report with a table of all results including rationale and invalidation."""
-    
-    def get_signal_color(signal: str) -> str:
-        """Return color for signal type."""
-        colors = {
-            "BUY": "#10b981",
-            "SELL": "#ef4444",
-            "HOLD": "#6b7280"
-        }
-        return colors.get(signal, "#000000")
-    
-    def format_targets(targets: List[float]) -> str:
-        """Format targets array as string."""
-        if not targets:
-            return "-"
-        return ", ".join([f"{t:.5f}" for t in targets])
-    
-    def format_number(value: Optional[float]) -> str:
-        """Format number or return dash."""
-        if value is None:
-            return "-"
-        return f"{value:.5f}"
-    
-    def format_confidence(conf: float) -> str:
-        """Format confidence with color coding."""
-        color = "#10b981" if conf >= 0.7 else "#f59e0b" if conf >= 0.4 else "#ef4444"
-        return f'<span style="color: {color}; font-weight: bold;">{conf:.2f}</span>'
-    
-    # Sort results: by symbol, then by prompt_name
-    sorted_results = sorted(results, key=lambda x: (x.get("symbol", ""), x.get("prompt_name", "")))
-    
-    html = f"""<!DOCTYPE html>
+# Page head, stats and table header, filled with str.format_map
+REPORT_HEAD_TEMPLATE = """<!DOCTYPE html>
 <html lang="de">
 <head>
     <meta charset="UTF-8">
@@ -469,30 +504,30 @@ def generate_html_report(results: List[Dict[str, Any]], output_path: Path, times
             <h1>📊 Trading Signals Report</h1>
             <div class="meta">
                 <div>Zeitpunkt: {timestamp_utc}</div>
-                <div>Symbole: {', '.join(symbols)} | Timeframe: {timeframe}</div>
+                <div>Symbole: {symbols} | Timeframe: {timeframe}</div>
             </div>
         </div>
         
         <div class="stats">
             <div class="stat-card">
                 <div class="label">Gesamt Signale</div>
-                <div class="value">{len(results)}</div>
+                <div class="value">{total}</div>
             </div>
             <div class="stat-card">
                 <div class="label">BUY Signale</div>
-                <div class="value" style="color: #10b981;">{sum(1 for r in results if r.get('signal') == 'BUY')}</div>
+                <div class="value" style="color: #10b981;">{buy_count}</div>
             </div>
             <div class="stat-card">
                 <div class="label">SELL Signale</div>
-                <div class="value" style="color: #ef4444;">{sum(1 for r in results if r.get('signal') == 'SELL')}</div>
+                <div class="value" style="color: #ef4444;">{sell_count}</div>
             </div>
             <div class="stat-card">
                 <div class="label">HOLD Signale</div>
-                <div class="value" style="color: #6b7280;">{sum(1 for r in results if r.get('signal') == 'HOLD')}</div>
+                <div class="value" style="color: #6b7280;">{hold_count}</div>
             </div>
             <div class="stat-card">
                 <div class="label">Durchschn. Confidence</div>
-                <div class="value">{sum(r.get('confidence', 0) for r in results) / len(results) if results else 0:.2f}</div>
+                <div class="value">{avg_confidence:.2f}</div>
             </div>
         </div>
         
@@ -501,7 +536,7 @@ def generate_html_report(results: List[Dict[str, Any]], output_path: Path, times
                 Symbol filtern:
                 <select id="symbolFilter" onchange="filterTable()">
                     <option value="">Alle</option>
-                    {''.join([f'<option value="{s}">{s}</option>' for s in symbols])}
+                    {symbol_options}
                 </select>
             </label>
             <label>
@@ -547,36 +582,31 @@ def generate_html_report(results: List[Dict[str, Any]], output_path: Path, times
                 </thead>
                 <tbody>
 """
-    
-    for result in sorted_results:
-        signal = result.get("signal", "HOLD")
-        signal_color = get_signal_color(signal)
-        rationale = result.get("rationale", "-") or "-"
-        invalidation = result.get("invalidation", "-") or "-"
-        
-        html += f"""                    <tr data-symbol="{result.get('symbol', '')}" 
+
+# One table row per result, filled with str.format_map
+REPORT_ROW_TEMPLATE = """                    <tr data-symbol="{symbol_attr}" 
                             data-signal="{signal}" 
-                            data-prompt="{result.get('prompt_name', '')}">
-                        <td><strong>{result.get('symbol', '-')}</strong></td>
-                        <td>{result.get('prompt_name', '-')}</td>
+                            data-prompt="{prompt_attr}">
+                        <td><strong>{symbol}</strong></td>
+                        <td>{prompt_name}</td>
                         <td>
                             <span class="signal-badge" style="background-color: {signal_color};">
                                 {signal}
                             </span>
                         </td>
-                        <td>{format_confidence(result.get('confidence', 0))}</td>
-                        <td>{format_number(result.get('current_price'))}</td>
-                        <td>{format_number(result.get('entry'))}</td>
-                        <td>{format_number(result.get('stop'))}</td>
-                        <td class="targets-cell">{format_targets(result.get('targets', []))}</td>
-                        <td>{result.get('entry_distance_pips') if result.get('entry_distance_pips') is not None else '-'}</td>
+                        <td>{confidence}</td>
+                        <td>{current_price}</td>
+                        <td>{entry}</td>
+                        <td>{stop}</td>
+                        <td class="targets-cell">{targets}</td>
+                        <td>{entry_distance_pips}</td>
                         <td class="text-cell">{rationale}</td>
                         <td class="text-cell">{invalidation}</td>
-                        <td style="font-size: 0.85em; color: #6c757d;">{result.get('timestamp_utc', '-')}</td>
+                        <td style="font-size: 0.85em; color: #6c757d;">{timestamp_utc}</td>
                     </tr>
 """
-    
-    html += """                </tbody>
+
+REPORT_FOOTER = """                </tbody>
             </table>
         </div>
     </div>
@@ -611,35 +641,544 @@ def generate_html_report(results: List[Dict[str, Any]], output_path: Path, times
     </script>
 </body>
 </html>"""
+
+
+# -----------------------------
+# Helpers
+# -----------------------------
+def utc_now_iso() -> str:
+    return datetime.now(timezone.utc).replace(microsecond=0).isoformat()
+
+
+@functools.lru_cache(maxsize=128)
+def format_price_time(price_timestamp: Optional[int]) -> str:
+    """Format a TwelveData unix timestamp for the prompt."""
+    if not price_timestamp:
+        return "Unknown"
+    return datetime.fromtimestamp(price_timestamp, tz=timezone.utc).strftime("%Y-%m-%d %H:%M:%S UTC")
+
+
+def safe_read_text(path: Path) -> str:
+    try:
+        mtime_ns = path.stat().st_mtime_ns
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Prompt file not found: {path}") from None
+    return _read_prompt(path, mtime_ns)
+
+
+@functools.lru_cache(maxsize=32)
+def _read_prompt(path: Path, mtime_ns: int) -> str:
+    """Read a prompt file; keyed on mtime so edited files are read again."""
+    content = path.read_text(encoding="utf-8").strip()
+    if not content:
+        raise ValueError(f"Prompt file is empty: {path}")
+    return content
+
+
+def get_pip_value(symbol: str) -> float:
+    """Get pip value for a symbol."""
+    pip_value = PIP_VALUES.get(symbol)
+    if pip_value is not None:
+        return pip_value
+    # Default: try to infer from symbol
+    if "JPY" in symbol:
+        return 1.00
+    elif "XAU" in symbol or "GOLD" in symbol.upper():
+        return 10.00
+    else:
+        return 0.0100  # Default for major pairs
+
+
+def calculate_pip_distance(entry: Optional[float], current_price: Optional[float], pip_value: float) -> Optional[float]:
+    """Calculate pip distance between entry and current price, given the symbol's pip value."""
+    if entry is None or current_price is None:
+        return None
     
-    output_path.write_text(html, encoding="utf-8")
+    distance = abs(entry - current_price)
+    pips = distance / pip_value
+    return round(pips, 2)
 
 
-def validate_entry_price(
-    result: Dict[str, Any],
-    current_price: Optional[float],
-    symbol: str
-) -> Dict[str, Any]:
+def format_symbol_for_twelvedata(symbol: str) -> str:
     """
-    Validate entry price against current market price.
-    Returns validation result with potential signal override.
+    Convert symbol format to TwelveData format.
+    EURUSD -> EUR/USD, AUDJPY -> AUD/JPY, etc.
     """
-    validation = {
-        "valid": True,
-        "original_signal": result.get("signal"),
-        "final_signal": result.get("signal"),
-        "violation_reason": None,
-        "entry_distance_pips": None,
-        "current_price": current_price,
-        "warnings": []
-    }
+    # For XAUUSD (Gold), use XAU/USD
+    if symbol == "XAUUSD":
+        return "XAU/USD"
     
-    # If HOLD, no validation needed
-    if result.get("signal") == "HOLD":
-        validation["entry_distance_pips"] = None
-        return validation
+    # For other pairs, insert / after first 3 characters
+    if len(symbol) == 6:
+        return f"{symbol[:3]}/{symbol[3:]}"
     
-    # If no current price, cannot validate
+    # If already has /, return as is
+    if "/" in symbol:
+        return symbol
+    
+    # Default: try to split at 3 chars
+    return symbol
+
+
+def get_twelvedata_client() -> httpx.AsyncClient:
+    """Return the shared TwelveData client, creating it on first use."""
+    global _TD_CLIENT
+    if _TD_CLIENT is None or _TD_CLIENT.is_closed:
+        _TD_CLIENT = httpx.AsyncClient(
+            trust_env=False,
+            timeout=10.0,
+            transport=httpx.AsyncHTTPTransport(
+                http2=False,
+                retries=2,
+                limits=httpx.Limits(max_keepalive_connections=8),
+            ),
+        )
+    return _TD_CLIENT
+
+
+def get_openai_client() -> AsyncOpenAI:
+    """Return the shared OpenAI client, creating it on first use."""
+    global _OPENAI_CLIENT
+    if _OPENAI_CLIENT is None:
+        http_client = httpx.AsyncClient(
+            trust_env=False,
+            timeout=60.0,
+            # Limits belong to the transport once a custom one is given;
+            # retries cover connection setup failures only (DNS, connect, TLS)
+            transport=httpx.AsyncHTTPTransport(
+                http2=False,
+                retries=2,
+                limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+            ),
+        )
+        _OPENAI_CLIENT = AsyncOpenAI(
+            api_key=os.environ.get("OPENAI_API_KEY"),
+            http_client=http_client,
+        )
+    return _OPENAI_CLIENT
+
+
+async def close_clients() -> None:
+    """Close the shared TwelveData and OpenAI clients if they were created."""
+    global _TD_CLIENT, _OPENAI_CLIENT
+    if _TD_CLIENT is not None:
+        await _TD_CLIENT.aclose()
+        _TD_CLIENT = None
+    if _OPENAI_CLIENT is not None:
+        await _OPENAI_CLIENT.close()
+        _OPENAI_CLIENT = None
+
+
+async def fetch_current_market_data_async(symbol: str) -> Optional[Dict[str, Any]]:
+    """
+    Fetch current market data using TwelveData API.
+    Returns dict with current_price, timestamp, and price_source.
+    """
+    if not TWELVEDATA_API_KEY:
+        print(f"Warning: TWELVEDATA_API_KEY not set. Cannot fetch real-time data for {symbol}.")
+        return None
+    
+    try:
+        # Format symbol for TwelveData (EURUSD -> EUR/USD)
+        formatted_symbol = format_symbol_for_twelvedata(symbol)
+        
+        url = f"{TWELVEDATA_BASE_URL}/price"
+        params = {
+            "symbol": formatted_symbol,
+            "apikey": TWELVEDATA_API_KEY
+        }
+        
+        response = await get_twelvedata_client().get(url, params=params)
+        response.raise_for_status()
+        data = response.json()
+        
+        # Check for API errors
+        if "code" in data:
+            error_msg = data.get("message", "Unknown error")
+            print(f"Warning: TwelveData API error for {symbol} ({formatted_symbol}): {error_msg}")
+            return None
+        
+        # Extract price
+        if "price" not in data:
+            print(f"Warning: No price data in response for {symbol} ({formatted_symbol})")
+            return None
+        
+        current_price = float(data["price"])
+        timestamp = data.get("timestamp", int(time.time()))
+        
+        return {
+            "current_price": current_price,
+            "timestamp": timestamp,
+            "price_source": "TwelveData",
+            "symbol": symbol
+        }
+        
+    except httpx.HTTPError as e:
+        print(f"Warning: HTTP error fetching market data for {symbol}: {type(e).__name__}: {str(e)}")
+        return None
+    except (ValueError, KeyError) as e:
+        print(f"Warning: Invalid response format for {symbol}: {type(e).__name__}: {str(e)}")
+        return None
+    except Exception as e:
+        print(f"Warning: Could not fetch market data for {symbol}: {type(e).__name__}: {str(e)}")
+        return None
+
+
+def read_price_cache() -> Dict[str, Dict[str, Any]]:
+    """Read the price cache, dropping entries that have expired."""
+    try:
+        cache = json_loads(PRICE_CACHE_PATH.read_bytes())
+    except FileNotFoundError:
+        return {}
+    except Exception as e:
+        print(f"Warning: Ignoring unreadable price cache {PRICE_CACHE_PATH}: {e}")
+        return {}
+    if not isinstance(cache, dict):
+        print(f"Warning: Ignoring malformed price cache {PRICE_CACHE_PATH}")
+        return {}
+    now = time.time()
+    # Entries not shaped like write_price_cache's {"expires": ts, "value": quote or None} are dropped
+    return {
+        key: entry for key, entry in cache.items()
+        if isinstance(entry, dict)
+        and isinstance(entry.get("expires"), (int, float)) and entry["expires"] > now
+        and "value" in entry and isinstance(entry["value"], (dict, type(None)))
+    }
+
+
+def write_price_cache(cache: Dict[str, Dict[str, Any]]) -> None:
+    """Persist the price cache, replacing the old file atomically."""
+    tmp_path = PRICE_CACHE_PATH.with_suffix(".tmp")
+    try:
+        tmp_path.write_bytes(json_dump_bytes(cache))
+        os.replace(tmp_path, PRICE_CACHE_PATH)
+    except Exception as e:
+        print(f"Warning: Could not write price cache {PRICE_CACHE_PATH}: {e}")
+
+
+async def fetch_current_market_data_cached(symbol: str, cache: Dict[str, Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Return the cached quote for this symbol and minute, fetching it on a miss."""
+    memo = _PRICE_MEMO.get(symbol)
+    if memo is not None and time.monotonic() - memo[0] < PRICE_MEMORY_TTL_SECONDS:
+        return memo[1]
+    
+    now = time.time()
+    key = f"{symbol}:{int(now // 60)}"
+    entry = cache.get(key)
+    if entry is not None and entry["expires"] > now:
+        value = entry["value"]
+    else:
+        value = await fetch_current_market_data_async(symbol)
+        ttl = PRICE_CACHE_TTL_SECONDS if value else PRICE_NEGATIVE_TTL_SECONDS
+        cache[key] = {"expires": now + ttl, "value": value}
+    
+    if value:
+        _PRICE_MEMO[symbol] = (time.monotonic(), value)
+    return value
+
+
+def load_market_data() -> Optional[Dict[str, Any]]:
+    """Load market data from file if path is provided."""
+    if not MARKET_DATA_JSON_PATH:
+        return None
+    p = Path(MARKET_DATA_JSON_PATH)
+    if not p.exists():
+        raise FileNotFoundError(f"MARKET_DATA_JSON_PATH does not exist: {p}")
+    return json_loads(p.read_bytes())
+
+
+def render_prompt(template: str, variables: Dict[str, Any]) -> str:
+    """Simple template substitution via {KEY}; unknown keys are left as-is."""
+    def substitute(match: re.Match) -> str:
+        key = match.group(1)
+        return str(variables[key]) if key in variables else match.group(0)
+    return PROMPT_VAR_RE.sub(substitute, template)
+
+
+async def backoff_sleep(attempt: int, retry_after: Optional[float] = None) -> None:
+    """Exponential backoff with jitter, or the server's Retry-After delay when given"""
+    base = min(2 ** attempt, 30) if retry_after is None else min(retry_after, 60)
+    await asyncio.sleep(base + random.uniform(0, 0.7))
+
+
+def retry_after_seconds(error: Exception) -> Optional[float]:
+    """Read the Retry-After delay from an OpenAI error response, if present."""
+    response = getattr(error, "response", None)
+    if response is None:
+        return None
+    headers = response.headers
+    try:
+        if "retry-after-ms" in headers:
+            return float(headers["retry-after-ms"]) / 1000
+        if "retry-after" in headers:
+            return float(headers["retry-after"])
+    except ValueError:
+        pass  # HTTP-date form; fall back to exponential backoff
+    return None
+
+
+async def read_streamed_json(stream: Any) -> str:
+    """
+    Collect streamed content up to the end of the top-level JSON object.
+    The stream is always read to the end so the pooled connection can be reused;
+    raises ValueError if the model stopped at the token limit.
+    """
+    parts: List[str] = []
+    depth = 0
+    in_string = False
+    escaped = False
+    complete = False
+    finish_reason = None
+    try:
+        async for chunk in stream:
+            if not chunk.choices:
+                continue
+            choice = chunk.choices[0]
+            finish_reason = getattr(choice, "finish_reason", None) or finish_reason
+            delta = choice.delta.content
+            # Anything after the closing brace is ignored, but still drained
+            if not delta or complete:
+                continue
+            parts.append(delta)
+            for i, ch in enumerate(delta):
+                if in_string:
+                    if escaped:
+                        escaped = False
+                    elif ch == "\\":
+                        escaped = True
+                    elif ch == '"':
+                        in_string = False
+                elif ch == '"':
+                    in_string = True
+                elif ch == "{":
+                    depth += 1
+                elif ch == "}":
+                    depth -= 1
+                    if depth == 0:
+                        parts[-1] = delta[:i + 1]
+                        complete = True
+                        break
+    finally:
+        await stream.close()
+    if finish_reason == "length":
+        raise ValueError("Model response was cut off at the token limit (finish_reason=length)")
+    return "".join(parts)
+
+
+def estimate_request_tokens(*messages: str, completions: int = 1) -> int:
+    """Rough token count for a request: ~4 characters per token plus the expected completions."""
+    return sum(len(m) for m in messages) // 4 + EXPECTED_COMPLETION_TOKENS * completions
+
+
+class RateLimiter:
+    """Request and token buckets per minute, refilled continuously and shared by all tasks."""
+    
+    def __init__(self, requests_per_minute: float, tokens_per_minute: float) -> None:
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.available_requests = requests_per_minute
+        self.available_tokens = tokens_per_minute
+        self.last_update = time.monotonic()
+        self._lock = asyncio.Lock()
+    
+    def _refill(self) -> None:
+        now = time.monotonic()
+        elapsed = now - self.last_update
+        self.last_update = now
+        self.available_requests = min(
+            self.requests_per_minute,
+            self.available_requests + self.requests_per_minute * elapsed / 60,
+        )
+        self.available_tokens = min(
+            self.tokens_per_minute,
+            self.available_tokens + self.tokens_per_minute * elapsed / 60,
+        )
+    
+    async def acquire(self, tokens: int) -> None:
+        """Wait until one request and the given number of tokens are available, then take them."""
+        # A request larger than the whole bucket would otherwise wait forever
+        tokens = min(tokens, self.tokens_per_minute)
+        async with self._lock:
+            while True:
+                self._refill()
+                if self.available_requests >= 1 and self.available_tokens >= tokens:
+                    self.available_requests -= 1
+                    self.available_tokens -= tokens
+                    return
+                wait = max(
+                    (1 - self.available_requests) * 60 / self.requests_per_minute,
+                    (tokens - self.available_tokens) * 60 / self.tokens_per_minute,
+                )
+                await asyncio.sleep(wait)
+
+
+def is_quota_error(error: Optional[BaseException]) -> bool:
+    """True for a 429 caused by an exhausted quota rather than by the rate limit."""
+    return isinstance(error, openai.RateLimitError) and getattr(error, "code", None) == "insufficient_quota"
+
+
+def is_fatal_error(error: BaseException) -> bool:
+    """True for FATAL_ERRORS and quota errors, also when wrapped by the retry loop's RuntimeError."""
+    return any(
+        isinstance(err, FATAL_ERRORS) or is_quota_error(err)
+        for err in (error, error.__cause__)
+    )
+
+
+def ensure_dirs() -> None:
+    RUNS_DIR.mkdir(parents=True, exist_ok=True)
+
+
+def save_json(path: Union[str, Path], obj: Any, pretty: bool = True) -> None:
+    """Serialize to bytes in memory and write the file in one go."""
+    with open(path, "wb") as f:
+        f.write(json_dump_bytes(obj, pretty))
+
+
+def save_json_array(path: Path, items: List[Any]) -> None:
+    """Stream a compact JSON array element by element through a large write buffer."""
+    with path.open("wb", buffering=1024 * 1024) as f:
+        f.write(b"[")
+        for i, item in enumerate(items):
+            if i:
+                f.write(b",")
+            f.write(json_dump_bytes(item, pretty=False))
+        f.write(b"]")
+
+
+def llm_cache_key(*parts: Any) -> str:
+    """Hash the parts that determine a model request into a cache key."""
+    h = hashlib.sha256()
+    for part in parts:
+        h.update(str(part).encode("utf-8"))
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+def read_llm_cache(key: str) -> Optional[Dict[str, Any]]:
+    """Return the cached model response for this key if it has not expired; expired entries are deleted."""
+    path = LLM_CACHE_DIR / f"{key}.json"
+    try:
+        entry = json_loads(path.read_bytes())
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        print(f"Warning: Ignoring unreadable LLM cache entry {key}: {e}")
+        return None
+    if not isinstance(entry, dict) or entry.get("expires", 0) <= time.time():
+        try:
+            path.unlink(missing_ok=True)
+        except OSError as e:
+            print(f"Warning: Could not delete expired LLM cache entry {key}: {e}")
+        return None
+    return entry.get("data")
+
+
+def write_llm_cache(key: str, data: Dict[str, Any]) -> None:
+    """Store a model response under this key for LLM_CACHE_TTL_SECONDS."""
+    path = LLM_CACHE_DIR / f"{key}.json"
+    tmp_path = path.with_suffix(".tmp")
+    try:
+        LLM_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp_path.write_bytes(json_dump_bytes({"expires": time.time() + LLM_CACHE_TTL_SECONDS, "data": data}))
+        os.replace(tmp_path, path)
+    except Exception as e:
+        print(f"Warning: Could not write LLM cache entry {key}: {e}")
+
+
+def append_markdown(path: Union[str, Path], *mds: str) -> None:
+    with open(path, "a", encoding="utf-8") as f:
+        f.write("".join(md.rstrip() + "\n" for md in mds))
+
+
+def generate_html_report(results: List[Dict[str, Any]], output_path: Path, timestamp_utc: str, symbols: List[str], timeframe: str) -> None:
+    """Generate an HTML report with a table of all results including rationale and invalidation."""
+    
+    def format_targets(targets: List[float]) -> str:
+        """Format targets array as string."""
+        if not targets:
+            return "-"
+        return ", ".join(["%.5f" % t for t in targets])
+    
+    def format_number(value: Optional[float]) -> str:
+        """Format number or return dash."""
+        return "-" if value is None else "%.5f" % value
+    
+    def format_confidence(conf: float) -> str:
+        """Format confidence with color coding."""
+        color = "#10b981" if conf >= 0.7 else "#f59e0b" if conf >= 0.4 else "#ef4444"
+        return f'<span style="color: {color}; font-weight: bold;">{conf:.2f}</span>'
+    
+    # Sort results: by symbol, then by prompt_name
+    sorted_results = sorted(results, key=lambda x: (x.get("symbol", ""), x.get("prompt_name", "")))
+    
+    # Signal counts and confidence total in a single pass
+    signal_counts: Counter = Counter()
+    confidence_sum = 0.0
+    for r in results:
+        signal_counts[r.get('signal')] += 1
+        confidence_sum += r.get('confidence', 0)
+    
+    # Stream straight to disk; only one row is held in memory at a time
+    with output_path.open("w", encoding="utf-8", buffering=1024 * 1024) as f:
+        f.write(REPORT_HEAD_TEMPLATE.format_map({
+            "timestamp_utc": timestamp_utc,
+            "symbols": ", ".join(symbols),
+            "timeframe": timeframe,
+            "total": len(results),
+            "buy_count": signal_counts['BUY'],
+            "sell_count": signal_counts['SELL'],
+            "hold_count": signal_counts['HOLD'],
+            "avg_confidence": confidence_sum / len(results) if results else 0,
+            "symbol_options": "".join([f'<option value="{s}">{s}</option>' for s in symbols]),
+        }))
+        
+        for result in sorted_results:
+            signal = result.get("signal", "HOLD")
+            entry_distance_pips = result.get("entry_distance_pips")
+            f.write(REPORT_ROW_TEMPLATE.format_map({
+                "symbol_attr": result.get("symbol", ""),
+                "signal": signal,
+                "prompt_attr": result.get("prompt_name", ""),
+                "symbol": result.get("symbol", "-"),
+                "prompt_name": result.get("prompt_name", "-"),
+                "signal_color": SIGNAL_COLORS.get(signal, "#000000"),
+                "confidence": format_confidence(result.get("confidence", 0)),
+                "current_price": format_number(result.get("current_price")),
+                "entry": format_number(result.get("entry")),
+                "stop": format_number(result.get("stop")),
+                "targets": format_targets(result.get("targets", [])),
+                "entry_distance_pips": entry_distance_pips if entry_distance_pips is not None else "-",
+                "rationale": result.get("rationale", "-") or "-",
+                "invalidation": result.get("invalidation", "-") or "-",
+                "timestamp_utc": result.get("timestamp_utc", "-"),
+            }))
+        
+        f.write(REPORT_FOOTER)
+
+
+def validate_entry_price(result: Dict[str, Any], ctx: SymbolContext) -> Dict[str, Any]:
+    """
+    Validate entry price against the symbol's current market price.
+    Returns validation result with potential signal override.
+    """
+    current_price = ctx.current_price
+    validation = {
+        "valid": True,
+        "original_signal": result.get("signal"),
+        "final_signal": result.get("signal"),
+        "violation_reason": None,
+        "entry_distance_pips": None,
+        "current_price": current_price,
+        "warnings": []
+    }
+    
+    # If HOLD, no validation needed
+    if result.get("signal") == "HOLD":
+        validation["entry_distance_pips"] = None
+        return validation
+    
+    # If no current price, cannot validate
     if current_price is None:
         validation["warnings"].append("No current price available for validation")
         validation["entry_distance_pips"] = None
@@ -656,7 +1195,7 @@ def validate_entry_price(
         return validation
     
     # Calculate pip distance
-    pip_distance = calculate_pip_distance(entry, current_price, symbol)
+    pip_distance = calculate_pip_distance(entry, current_price, ctx.pip_value)
     validation["entry_distance_pips"] = pip_distance
     
     # Check if within 100 pips
@@ -679,154 +1218,311 @@ def validate_entry_price(
 # -----------------------------
 # OpenAI Call
 # -----------------------------
-def call_model_structured(
-    client: OpenAI,
+def render_user_message(
     prompt: str,
     prompt_name: str,
     symbol: str,
     timeframe: str,
-    timestamp_utc: str,
+    time_ctx: TimeCtx,
     notes: str,
     current_price: Optional[float],
     price_source: str,
     price_timestamp: Optional[int],
-    current_datetime: Optional[datetime] = None,
+) -> str:
+    """Fill USER_PROMPT_TEMPLATE for one request."""
+    return USER_PROMPT_TEMPLATE.format_map({
+        "current_date": time_ctx.date_str,
+        "current_day": time_ctx.day_name,
+        "current_time": time_ctx.time_str,
+        "timestamp_utc": time_ctx.timestamp_utc,
+        "current_price": current_price if current_price is not None else "NOT AVAILABLE",
+        "price_source": price_source,
+        "price_time": format_price_time(price_timestamp),
+        "symbol": symbol,
+        "timeframe": timeframe,
+        "prompt_name": prompt_name,
+        "notes": notes,
+        "reference_price": current_price,
+        "prompt": prompt,
+    })
+
+
+async def request_structured(
+    client: AsyncOpenAI,
+    user: str,
+    schema: Dict[str, Any],
+    validator: Optional[Any],
+    request_tokens: int,
     max_retries: int = 5,
+    semaphore: Optional[asyncio.Semaphore] = None,
+    rate_limiter: Optional[RateLimiter] = None,
 ) -> Dict[str, Any]:
-    """
-    Call the model with structured outputs using JSON schema.
-    Includes real-time price data and validation.
-    """
-    system = (
-        "You are a trading signal analysis assistant for a study. "
-        "Do NOT provide investment advice. Your role is to analyze market conditions and provide actionable trading signals. "
-        "CRITICAL: You MUST use the REAL-TIME market price provided in the prompt. "
-        "NEVER invent or estimate prices - use ONLY the current_price provided. "
-        "SIGNAL GUIDELINES: "
-        "- Prefer BUY or SELL signals when there is any reasonable basis for a directional view. "
-        "- HOLD is acceptable ONLY when there is genuinely NO trade opportunity. "
-        "- Be decisive: if you can identify any trend, pattern, or market condition, provide a BUY or SELL signal. "
-        "ENTRY PRICE REQUIREMENTS (CRITICAL): "
-        "- Entry price MUST be within 100 PIPS of the CURRENT market price provided. "
-        "- For JPY pairs (AUDJPY): 100 pips = 1.00. "
-        "- For major pairs (EURUSD): 100 pips = 0.0100. "
-        "- For XAUUSD (Gold): 100 pips = 10.00. "
-        "- Entry must be close to current market price - maximum 100 pips away. "
-        "- If you cannot set an entry within 100 pips of current price, return HOLD. "
-        "- Use the EXACT current_price provided as reference. "
-        "TIMING REQUIREMENTS: "
-        "- Trades must be executable within the NEXT HOUR from the current timestamp. "
-        "- Entry prices must be realistic and achievable within 1 hour. "
-        "- Trades should be designed for short-term execution on the 5-minute timeframe. "
-        "- Maximum trade duration: 5 hours."
-    )
-    
-    # Format current date/time info
-    current_datetime = current_datetime or datetime.now(timezone.utc)
-    current_date_str = current_datetime.strftime("%Y-%m-%d")
-    current_time_str = current_datetime.strftime("%H:%M:%S UTC")
-    current_day_name = current_datetime.strftime("%A")
-    
-    # Format price timestamp
-    if price_timestamp:
-        price_time = datetime.fromtimestamp(price_timestamp, tz=timezone.utc).strftime("%Y-%m-%d %H:%M:%S UTC")
-    else:
-        price_time = "Unknown"
-    
-    user = (
-        f"CURRENT DATE AND TIME:\n"
-        f"- Date: {current_date_str} ({current_day_name})\n"
-        f"- Time: {current_time_str}\n"
-        f"- Timestamp UTC: {timestamp_utc}\n\n"
-        f"REAL-TIME MARKET PRICE:\n"
-        f"- Current market price = {current_price if current_price is not None else 'NOT AVAILABLE'}\n"
-        f"- Price source: {price_source}\n"
-        f"- Price timestamp: {price_time}\n\n"
-        f"TRADING PARAMETERS:\n"
-        f"- Symbol: {symbol}\n"
-        f"- Timeframe: {timeframe}\n"
-        f"- Prompt: {prompt_name}\n"
-        f"- Notes: {notes}\n\n"
-        f"CRITICAL: Entry price MUST be within 100 pips of the current market price ({current_price}). "
-        f"Use this EXACT price as your reference. Do NOT estimate or invent prices.\n\n"
-        f"TASK:\n{prompt}\n"
-    )
-    
+    """Send one structured-output request, retrying transient failures with backoff."""
     last_err = None
     for attempt in range(max_retries):
         try:
-            response = client.chat.completions.create(
-                model=MODEL,
-                messages=[
-                    {"role": "system", "content": system},
-                    {"role": "user", "content": user},
-                ],
-                response_format={
-                    "type": "json_schema",
-                    "json_schema": {
-                        "name": SIGNAL_SCHEMA["name"],
-                        "strict": True,
-                        "schema": SIGNAL_SCHEMA["schema"],
-                    }
-                },
-            )
+            if rate_limiter is not None:
+                await rate_limiter.acquire(request_tokens)
+            # Only the request itself holds a concurrency slot, not the backoff
+            async with semaphore or contextlib.nullcontext():
+                stream = await client.chat.completions.create(
+                    model=MODEL,
+                    messages=[
+                        {"role": "system", "content": SYSTEM_PROMPT},
+                        {"role": "user", "content": user},
+                    ],
+                    response_format={
+                        "type": "json_schema",
+                        "json_schema": {
+                            "name": schema["name"],
+                            "strict": True,
+                            "schema": schema["schema"],
+                        }
+                    },
+                    stream=True,
+                )
+                content = await read_streamed_json(stream)
             
-            if not response.choices or not response.choices[0].message.content:
+            if not content:
                 raise ValueError("Empty response from OpenAI API")
             
             # Parse JSON response
-            data = json.loads(response.choices[0].message.content)
-            
-            # Ensure required fields are set
-            data["prompt_name"] = prompt_name
-            data["symbol"] = data.get("symbol") or symbol
-            data["timeframe"] = data.get("timeframe") or timeframe
-            data["timestamp_utc"] = data.get("timestamp_utc") or timestamp_utc
-            data["raw_notes"] = data.get("raw_notes") or notes
-            data["current_price"] = current_price
-            data["entry_distance_pips"] = calculate_pip_distance(
-                data.get("entry"),
-                current_price,
-                symbol
-            )
-            
+            data = json_loads(content)
+            if validator is not None:
+                validator(data)
             return data
             
         except Exception as e:
             last_err = f"{type(e).__name__}: {str(e)}"
+            # An exhausted quota is a 429 too, but waiting will not refill it
+            if isinstance(e, NON_RETRYABLE_ERRORS) or is_quota_error(e):
+                print(f"Attempt {attempt + 1}/{max_retries} failed permanently: {last_err}")
+                raise RuntimeError(f"OpenAI call failed with a non-retryable error: {last_err}") from e
             print(f"Attempt {attempt + 1}/{max_retries} failed: {last_err}")
             if attempt < max_retries - 1:
-                backoff_sleep(attempt)
+                await backoff_sleep(attempt, retry_after_seconds(e))
     
     raise RuntimeError(
         f"OpenAI call failed after {max_retries} attempts. Last error: {last_err}"
     )
 
 
-def main() -> None:
+def complete_result(
+    data: Dict[str, Any],
+    prompt_name: str,
+    symbol: str,
+    timeframe: str,
+    timestamp_utc: str,
+    notes: str,
+    current_price: Optional[float],
+    pip_value: float,
+) -> Dict[str, Any]:
+    """Add the fields known locally to a model signal, keeping the saved key order stable."""
+    raw_notes = data.pop("raw_notes", None)
+    return {
+        "symbol": symbol,
+        "timeframe": timeframe,
+        "timestamp_utc": timestamp_utc,
+        **data,
+        "prompt_name": prompt_name,
+        "raw_notes": raw_notes or notes,
+        "current_price": current_price,
+        "entry_distance_pips": calculate_pip_distance(
+            data.get("entry"),
+            current_price,
+            pip_value
+        ),
+    }
+
+
+async def call_model_structured(
+    client: AsyncOpenAI,
+    prompt: str,
+    prompt_name: str,
+    symbol: str,
+    timeframe: str,
+    time_ctx: TimeCtx,
+    notes: str,
+    current_price: Optional[float],
+    pip_value: float,
+    price_source: str,
+    price_timestamp: Optional[int],
+    max_retries: int = 5,
+    semaphore: Optional[asyncio.Semaphore] = None,
+    cache_key: Optional[str] = None,
+    rate_limiter: Optional[RateLimiter] = None,
+) -> Dict[str, Any]:
+    """
+    Call the model with structured outputs using JSON schema.
+    Includes real-time price data and validation.
+    cache_key identifies the request apart from wall-clock time; when given,
+    a cached response for the same key is returned without calling the API.
+    """
+    user = render_user_message(
+        prompt, prompt_name, symbol, timeframe, time_ctx,
+        notes, current_price, price_source, price_timestamp,
+    )
+    
+    key = llm_cache_key(MODEL, SYSTEM_PROMPT, SIGNAL_SCHEMA, cache_key) if cache_key and LLM_CACHE_TTL_SECONDS > 0 else None
+    data = read_llm_cache(key) if key else None
+    cached = data is not None
+    if cached:
+        print(f"  ↺ Reusing cached response for {symbol} - {prompt_name}")
+    else:
+        data = await request_structured(
+            client, user, SIGNAL_SCHEMA, validate_signal,
+            estimate_request_tokens(SYSTEM_PROMPT, user),
+            max_retries=max_retries, semaphore=semaphore, rate_limiter=rate_limiter,
+        )
+        if key:
+            write_llm_cache(key, data)
+    
+    result = complete_result(data, prompt_name, symbol, timeframe, time_ctx.timestamp_utc, notes, current_price, pip_value)
+    if cached:
+        # Not a fresh sample for this run; lets the analysis tell reused answers apart
+        result["cached"] = True
+    return result
+
+
+async def call_model_batch(
+    client: AsyncOpenAI,
+    prompts: Dict[str, str],
+    symbol: str,
+    timeframe: str,
+    time_ctx: TimeCtx,
+    notes: str,
+    current_price: Optional[float],
+    pip_value: float,
+    price_source: str,
+    price_timestamp: Optional[int],
+    max_retries: int = 5,
+    semaphore: Optional[asyncio.Semaphore] = None,
+    rate_limiter: Optional[RateLimiter] = None,
+) -> Dict[str, Dict[str, Any]]:
+    """Answer several prompts for one symbol in a single request; returns results by prompt name."""
+    combined = BATCH_TASK_INTRO + "\n\n".join(
+        f"=== {name} ===\n{prompt}" for name, prompt in prompts.items()
+    )
+    user = render_user_message(
+        combined, ", ".join(prompts), symbol, timeframe, time_ctx,
+        notes, current_price, price_source, price_timestamp,
+    )
+    
+    data = await request_structured(
+        client, user, BATCH_SIGNAL_SCHEMA, validate_signal_batch,
+        estimate_request_tokens(SYSTEM_PROMPT, user, completions=len(prompts)),
+        max_retries=max_retries, semaphore=semaphore, rate_limiter=rate_limiter,
+    )
+    
+    signals = {signal.pop("prompt_name"): signal for signal in data["signals"]}
+    missing = [name for name in prompts if name not in signals]
+    if missing:
+        raise ValueError(f"Batched response is missing signals for: {', '.join(missing)}")
+    
+    return {
+        name: complete_result(signals[name], name, symbol, timeframe, time_ctx.timestamp_utc, notes, current_price, pip_value)
+        for name in prompts
+    }
+
+
+async def run_prompt(
+    client: AsyncOpenAI,
+    ctx: SymbolContext,
+    spec: PromptSpec,
+    templates: Dict[str, str],
+    time_ctx: TimeCtx,
+    semaphore: asyncio.Semaphore,
+    rate_limiter: RateLimiter,
+) -> Dict[str, Any]:
+    """Render one prompt template for a symbol and call the model with it."""
+    print(f"Processing {ctx.symbol} - {spec.name}...")
+    template = templates[spec.name]
+    prompt = render_prompt(template, ctx.variables)
+    
+    # Same template, symbol and quote means the same request apart from the clock
+    cache_key = llm_cache_key(
+        spec.name, template, ctx.symbol, TIMEFRAME, NOTES,
+        ctx.current_price, ctx.price_timestamp, ctx.variables["MARKET_DATA_JSON"],
+    )
+    
+    return await call_model_structured(
+        client=client,
+        prompt=prompt,
+        prompt_name=spec.name,
+        symbol=ctx.symbol,
+        timeframe=TIMEFRAME,
+        time_ctx=time_ctx,
+        notes=NOTES,
+        current_price=ctx.current_price,
+        pip_value=ctx.pip_value,
+        price_source=ctx.price_source,
+        price_timestamp=ctx.price_timestamp,
+        semaphore=semaphore,
+        cache_key=cache_key,
+        rate_limiter=rate_limiter,
+    )
+
+
+async def run_symbol_batch(
+    client: AsyncOpenAI,
+    ctx: SymbolContext,
+    templates: Dict[str, str],
+    time_ctx: TimeCtx,
+    semaphore: asyncio.Semaphore,
+    rate_limiter: RateLimiter,
+) -> List[Any]:
+    """
+    Run all prompts for a symbol as one batched request.
+    Falls back to one request per prompt if the batch fails; returns results
+    (or exceptions) in PROMPTS order.
+    """
+    print(f"Processing {ctx.symbol} - {', '.join(spec.name for spec in PROMPTS)} (batched)...")
+    try:
+        prompts = {spec.name: render_prompt(templates[spec.name], ctx.variables) for spec in PROMPTS}
+        results = await call_model_batch(
+            client=client,
+            prompts=prompts,
+            symbol=ctx.symbol,
+            timeframe=TIMEFRAME,
+            time_ctx=time_ctx,
+            notes=NOTES,
+            current_price=ctx.current_price,
+            pip_value=ctx.pip_value,
+            price_source=ctx.price_source,
+            price_timestamp=ctx.price_timestamp,
+            semaphore=semaphore,
+            rate_limiter=rate_limiter,
+        )
+        return [results[spec.name] for spec in PROMPTS]
+    except Exception as e:
+        # Per-prompt requests would fail the same way, so don't send them
+        if is_fatal_error(e):
+            raise
+        print(f"  ⚠ Batched request for {ctx.symbol} failed ({type(e).__name__}: {str(e)}); falling back to one request per prompt")
+        return await asyncio.gather(
+            *(run_prompt(client, ctx, spec, templates, time_ctx, semaphore, rate_limiter) for spec in PROMPTS),
+            return_exceptions=True,
+        )
+
+
+async def main() -> None:
     """Main function to run all prompts and save results."""
     try:
         ensure_dirs()
         if IGNORED_SYMBOLS:
             print(f"⚠ Ignoring unsupported symbols: {', '.join(IGNORED_SYMBOLS)}")
         
-        # Create httpx client with specified parameters
-        http_client = httpx.Client(
-            trust_env=False,
-            http2=False,
-            timeout=60.0,
-        )
-        
-        # Create OpenAI client with custom http_client
-        client = OpenAI(
-            api_key=os.environ.get("OPENAI_API_KEY"),
-            http_client=http_client,
-        )
+        # Shared OpenAI client; reused if main() runs again in the same event loop
+        client = get_openai_client()
         
         timestamp_utc = utc_now_iso()
+        # Filename-safe form of the run timestamp, shared by every output file
+        ts_safe = timestamp_utc.replace(":", "-")
         run_day = datetime.now().strftime("%Y-%m-%d")
         out_dir = RUNS_DIR / run_day
         out_dir.mkdir(parents=True, exist_ok=True)
+        # Per-symbol and per-prompt files are named from plain strings on this prefix
+        out_prefix = f"{out_dir}{os.sep}{ts_safe}"
         
         # Variables for prompt templates
         try:
@@ -835,23 +1531,50 @@ def main() -> None:
             print(f"Warning: Could not load market data: {type(e).__name__}: {str(e)}")
             market_data = None
         
+        # Serialized once; the same market data goes into every symbol's prompts
+        market_data_json = json_dumps(market_data) if market_data else ""
+        
         all_results: List[Dict[str, Any]] = []
         
-        # Get current date/time info
-        current_datetime = datetime.now(timezone.utc)
-        current_date_str = current_datetime.strftime("%Y-%m-%d")
-        current_time_str = current_datetime.strftime("%H:%M:%S UTC")
-        current_day_name = current_datetime.strftime("%A")
-        
-        # Process each symbol
-        for symbol in SYMBOLS:
-            print(f"\n{'='*60}")
-            print(f"Processing symbol: {symbol}")
-            print(f"{'='*60}\n")
-            
-            # Fetch current market data for this symbol
-            market_data_dict = fetch_current_market_data(symbol)
+        # Get current date/time info, formatted once for the whole run
+        time_ctx = TimeCtx.from_datetime(datetime.now(timezone.utc), timestamp_utc)
+        
+        semaphore = asyncio.Semaphore(OPENAI_MAX_CONCURRENCY)
+        rate_limiter = RateLimiter(MAX_REQUESTS_PER_MINUTE, MAX_TOKENS_PER_MINUTE)
+        
+        # Prompt variables that are the same for every symbol
+        variables_base = {
+            "TIMEFRAME": TIMEFRAME,
+            "TIMESTAMP_UTC": timestamp_utc,
+            "CURRENT_DATE": time_ctx.date_str,
+            "CURRENT_TIME": time_ctx.time_str,
+            "CURRENT_DAY": time_ctx.day_name,
+            "MARKET_DATA_JSON": market_data_json,
+            "NOTES": NOTES,
+        }
+        
+        # Report header lines shared by every symbol report
+        run_header = f"- Timeframe: {TIMEFRAME}\n- Run Times (Local): {RUN_TIMES_LOCAL}\n- Notes: {NOTES}\n"
+        
+        # Prompt templates don't change between symbols; read each one once per run
+        templates = {spec.name: safe_read_text(spec.path) for spec in PROMPTS}
+        
+        # Fetch current market data for all symbols concurrently
+        price_cache = read_price_cache()
+        price_tasks = [
+            asyncio.ensure_future(fetch_current_market_data_cached(symbol, price_cache))
+            for symbol in SYMBOLS
+        ]
+        
+        # Prepare each symbol as soon as its quote arrives and start its model calls
+        # right away, without waiting for the other symbols' prices
+        contexts: List[SymbolContext] = []
+        jobs: List[Tuple[SymbolContext, PromptSpec]] = []
+        tasks: List[asyncio.Future] = []
+        for symbol, price_task in zip(SYMBOLS, price_tasks):
+            print(f"\n{'='*60}\nProcessing symbol: {symbol}\n{'='*60}\n")
             
+            market_data_dict = await price_task
             if not market_data_dict:
                 print(f"  ⚠ WARNING: Could not fetch real-time price for {symbol}. Continuing without validation.")
                 current_price = None
@@ -864,56 +1587,70 @@ def main() -> None:
                 print(f"  ✓ Current price: {current_price} (Source: {price_source})")
             
             variables = {
+                **variables_base,
                 "SYMBOL": symbol,
-                "TIMEFRAME": TIMEFRAME,
-                "TIMESTAMP_UTC": timestamp_utc,
-                "CURRENT_DATE": current_date_str,
-                "CURRENT_TIME": current_time_str,
-                "CURRENT_DAY": current_day_name,
                 "CURRENT_PRICE": current_price if current_price is not None else "NOT AVAILABLE",
                 "PRICE_SOURCE": price_source,
                 "PRICE_TIMESTAMP": price_timestamp if price_timestamp else "Unknown",
-                "MARKET_DATA_JSON": json.dumps(market_data, ensure_ascii=False) if market_data else "",
-                "NOTES": NOTES,
             }
             
             # Create symbol-specific markdown report
-            md_path = out_dir / f"{timestamp_utc.replace(':', '-')}_{symbol}_report.md"
-            append_markdown(md_path, f"# Run {timestamp_utc} - {symbol}\n")
-            append_markdown(
-                md_path,
-                f"- Symbol: {symbol}\n- Timeframe: {TIMEFRAME}\n- Run Times (Local): {RUN_TIMES_LOCAL}\n- Notes: {NOTES}\n",
-            )
-            if current_price:
-                append_markdown(md_path, f"- Current Price: {current_price} (Source: {price_source})\n")
+            md_path = f"{out_prefix}_{symbol}_report.md"
+            md_parts = [
+                f"# Run {timestamp_utc} - {symbol}\n",
+                f"- Symbol: {symbol}\n" + run_header,
+            ]
+            if current_price is not None:
+                md_parts.append(f"- Current Price: {current_price} (Source: {price_source})\n")
             
-            # Process each prompt for this symbol
-            for spec in PROMPTS:
+            ctx = SymbolContext(
+                symbol, current_price, price_source, price_timestamp, variables, md_path,
+                get_pip_value(symbol), md_parts,
+            )
+            contexts.append(ctx)
+            jobs.extend((ctx, spec) for spec in PROMPTS)
+            if OPENAI_BATCH_PROMPTS:
+                tasks.append(asyncio.ensure_future(run_symbol_batch(client, ctx, templates, time_ctx, semaphore, rate_limiter)))
+            else:
+                tasks.extend(
+                    asyncio.ensure_future(run_prompt(client, ctx, spec, templates, time_ctx, semaphore, rate_limiter))
+                    for spec in PROMPTS
+                )
+        
+        write_price_cache(price_cache)
+        
+        # Wait for every model call; results come back in job order
+        gathered = await asyncio.gather(*tasks, return_exceptions=True)
+        if OPENAI_BATCH_PROMPTS:
+            outcomes = [
+                outcome
+                for results in gathered
+                for outcome in (results if isinstance(results, list) else [results] * len(PROMPTS))
+            ]
+        else:
+            outcomes = gathered
+        
+        # Validate and save each result in deterministic order; a failed prompt is
+        # recorded and skipped so the completed ones are still saved
+        failures: List[Dict[str, str]] = []
+        try:
+            for (ctx, spec), result in zip(jobs, outcomes):
+                symbol = ctx.symbol
+                current_price = ctx.current_price
+                md_parts = ctx.md_parts
                 try:
-                    print(f"Processing {symbol} - {spec.name}...")
-                    template = safe_read_text(spec.path)
-                    prompt = render_prompt(template, variables)
-                    
-                    result = call_model_structured(
-                        client=client,
-                        prompt=prompt,
-                        prompt_name=spec.name,
-                        symbol=symbol,
-                        timeframe=TIMEFRAME,
-                        timestamp_utc=timestamp_utc,
-                        notes=NOTES,
-                        current_price=current_price,
-                        price_source=price_source,
-                        price_timestamp=price_timestamp,
-                    )
+                    if isinstance(result, BaseException):
+                        raise result
                     
                     # Validate entry price
-                    validation = validate_entry_price(result, current_price, symbol)
+                    validation = validate_entry_price(result, ctx)
                     
                     # Apply validation result
                     if not validation["valid"]:
-                        print(f"  ⚠ WARNING: Entry price validation failed for {symbol} - {spec.name}")
-                        print(f"     Reason: {validation['violation_reason']}")
+                        print(
+                            f"  ⚠ WARNING: Entry price validation failed for {symbol} - {spec.name}\n"
+                            f"     Reason: {validation['violation_reason']}"
+                        )
                         for warning in validation["warnings"]:
                             print(f"     - {warning}")
                         
@@ -929,90 +1666,117 @@ def main() -> None:
                     all_results.append(result)
                     
                     # Save individual prompt result with symbol in filename
-                    json_path = out_dir / f"{timestamp_utc.replace(':', '-')}_{symbol}_{spec.name}.json"
+                    json_path = f"{out_prefix}_{symbol}_{spec.name}.json"
                     save_json(json_path, result)
                     
                     # Append to markdown report
-                    append_markdown(md_path, f"\n## {spec.name}\n")
-                    append_markdown(md_path, f"- Signal: **{result['signal']}**\n")
+                    md_parts.append(f"\n## {spec.name}\n")
+                    md_parts.append(f"- Signal: **{result['signal']}**\n")
                     if validation.get("original_signal") != result["signal"]:
-                        append_markdown(md_path, f"- Original Signal: {validation['original_signal']} (overridden by validation)\n")
-                    append_markdown(md_path, f"- Confidence: {result['confidence']}\n")
-                    append_markdown(md_path, f"- Current Price: {current_price if current_price else 'N/A'}\n")
-                    append_markdown(md_path, f"- Entry: {result['entry']}\n- Stop: {result['stop']}\n")
-                    append_markdown(md_path, f"- Entry Distance: {validation['entry_distance_pips'] if validation['entry_distance_pips'] else 'N/A'} pips\n")
-                    append_markdown(md_path, f"- Targets: {result['targets']}\n")
-                    append_markdown(md_path, f"- Rationale: {result['rationale']}\n")
-                    append_markdown(md_path, f"- Invalidation: {result['invalidation']}\n")
+                        md_parts.append(f"- Original Signal: {validation['original_signal']} (overridden by validation)\n")
+                    md_parts.append(f"- Confidence: {result['confidence']}\n")
+                    md_parts.append(f"- Current Price: {current_price if current_price is not None else 'N/A'}\n")
+                    md_parts.append(f"- Entry: {result['entry']}\n- Stop: {result['stop']}\n")
+                    md_parts.append(f"- Entry Distance: {validation['entry_distance_pips'] if validation['entry_distance_pips'] is not None else 'N/A'} pips\n")
+                    md_parts.append(f"- Targets: {result['targets']}\n")
+                    md_parts.append(f"- Rationale: {result['rationale']}\n")
+                    md_parts.append(f"- Invalidation: {result['invalidation']}\n")
                     if validation.get("warnings"):
-                        append_markdown(md_path, f"- Validation Warnings: {', '.join(validation['warnings'])}\n")
+                        md_parts.append(f"- Validation Warnings: {', '.join(validation['warnings'])}\n")
                     
                     print(f"  ✓ {symbol} - {spec.name} completed successfully")
                     
                 except Exception as e:
                     error_msg = f"{type(e).__name__}: {str(e)}"
                     print(f"  ✗ {symbol} - {spec.name} failed: {error_msg}")
-                    raise
+                    if is_fatal_error(e):
+                        raise
+                    failures.append({"symbol": symbol, "prompt": spec.name, "error": error_msg})
+                    md_parts.append(f"\n## {spec.name}\n- Failed: {error_msg}\n")
+        finally:
+            # One write per symbol report, including on failure
+            for ctx in contexts:
+                append_markdown(ctx.md_path, *ctx.md_parts)
         
-        # Save combined results for all symbols
-        combined_path = out_dir / f"{timestamp_utc.replace(':', '-')}_all.json"
-        save_json(combined_path, all_results)
+        if failures:
+            failures_path = out_dir / f"{ts_safe}_failures.json"
+            save_json(failures_path, failures)
+            print(f"\n⚠ {len(failures)} of {len(jobs)} prompt(s) failed; details in {failures_path.name}")
+            if not all_results:
+                raise RuntimeError(f"All {len(jobs)} prompts failed")
+        
+        # Save combined results for all symbols; machine-read, so written compact
+        combined_path = out_dir / f"{ts_safe}_all.json"
+        save_json_array(combined_path, all_results)
         
         # Generate HTML report for this run
-        html_path = out_dir / f"{timestamp_utc.replace(':', '-')}_report.html"
+        html_path = out_dir / f"{ts_safe}_report.html"
         generate_html_report(all_results, html_path, timestamp_utc, SYMBOLS, TIMEFRAME)
         print(f"  ✓ HTML report generated: {html_path.name}")
         
         # Update overall overview HTML
         try:
-            all_historical_results = []
-            for day_dir in sorted(RUNS_DIR.iterdir()):
-                if not day_dir.is_dir():
-                    continue
-                for json_file in day_dir.glob("*_all.json"):
-                    try:
-                        with open(json_file, 'r', encoding='utf-8') as f:
-                            results = json.load(f)
-                            if isinstance(results, list):
-                                all_historical_results.extend(results)
-                            else:
-                                all_historical_results.append(results)
-                    except Exception:
-                        pass
+            if generate_overview_html is None:
+                raise ImportError("generate_all_reports is not importable")
+            
+            # This run has just written a new _all.json, so the overview is always
+            # re-rendered here; it is stamped with the inputs' fingerprint so that a
+            # later standalone generate_all_reports.py can skip its own render
+            overview_path = RUNS_DIR / "all_runs_overview.html"
+            json_files = find_result_files()
+            fingerprint = compute_fingerprint(json_files)
+            
+            # Earlier runs come from the parsed-results cache and this run's results
+            # are reused from memory, so no result file is parsed again here
+            all_historical_results = load_all_results(
+                json_files, preloaded={str(combined_path): all_results}
+            )
             
             if all_historical_results:
-                import sys
-                sys.path.insert(0, str(BASE_DIR))
-                from generate_all_reports import generate_overview_html
-                
-                overview_path = RUNS_DIR / "all_runs_overview.html"
-                generate_overview_html(all_historical_results, overview_path)
+                generate_overview_html(all_historical_results, overview_path, fingerprint=fingerprint)
                 print(f"  ✓ Overall overview updated: {overview_path.name}")
         except Exception as e:
             print(f"  ⚠ Could not update overview: {type(e).__name__}: {str(e)}")
         
         # Create summary markdown
-        summary_path = out_dir / f"{timestamp_utc.replace(':', '-')}_summary.md"
-        append_markdown(summary_path, f"# Summary - Run {timestamp_utc}\n")
-        append_markdown(summary_path, f"- Symbols: {', '.join(SYMBOLS)}\n")
-        append_markdown(summary_path, f"- Timeframe: {TIMEFRAME}\n")
-        append_markdown(summary_path, f"- Run Times (Local): {RUN_TIMES_LOCAL}\n")
-        append_markdown(summary_path, f"- Total prompts processed: {len(all_results)}\n")
+        summary_path = out_dir / f"{ts_safe}_summary.md"
+        summary_parts = [
+            f"# Summary - Run {timestamp_utc}\n",
+            f"- Symbols: {', '.join(SYMBOLS)}\n",
+            f"- Timeframe: {TIMEFRAME}\n",
+            f"- Run Times (Local): {RUN_TIMES_LOCAL}\n",
+            f"- Total prompts processed: {len(all_results)}\n",
+        ]
+        if failures:
+            summary_parts.append(f"- Failed prompts: {len(failures)}\n")
+        append_markdown(summary_path, *summary_parts)
         
-        print(f"\n✓ Success: All results saved to {out_dir}")
-        print(f"  Processed {len(SYMBOLS)} symbol(s): {', '.join(SYMBOLS)}")
-        print(f"  Total results: {len(all_results)}")
+        if failures:
+            status = (
+                f"\n⚠ Partial success: {len(failures)} of {len(jobs)} prompt(s) failed, "
+                f"see {failures_path}\n  Remaining results saved to {out_dir}\n"
+            )
+        else:
+            status = f"\n✓ Success: All results saved to {out_dir}\n"
+        print(
+            f"{status}"
+            f"  Processed {len(SYMBOLS)} symbol(s): {', '.join(SYMBOLS)}\n"
+            f"  Total results: {len(all_results)}"
+        )
         
     except Exception as e:
         error_msg = f"{type(e).__name__}: {str(e)}"
         print(f"\n✗ Fatal error: {error_msg}")
         raise
-    
+
+
+async def run() -> None:
+    """Run the study once and release the shared HTTP clients."""
+    try:
+        await main()
     finally:
-        # Clean up http client
-        if 'http_client' in locals():
-            http_client.close()
+        await close_clients()
 
 
 if __name__ == "__main__":
-    main()
+    asyncio.run(run())